@@ -7,10 +7,15 @@ normalization.
 from __future__ import annotations
 
 import glob
+import json
 import os
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
 
 
 DATA_DIR = os.environ.get("FRAUD_DATA_DIR", "data")
@@ -29,21 +34,35 @@ _PYMT_PATTERNS = ["pymt_amt", "tot_pymt", "payment_amount", "avg_mdcd_pymt_amt",
                    "paid_amt", "mdcd_pymt_amt", "total_payment", "mdcd_paid_amt",
                    "total_paid"]
 
+# Single lookup of pattern -> (alias, priority); lower priority wins per alias
+_PATTERN_TO_ALIAS: dict[str, tuple[str, int]] = {
+    p: (alias, rank)
+    for alias, patterns in [
+        ("npi", _NPI_PATTERNS),
+        ("hcpcs", _HCPCS_PATTERNS),
+        ("date", _DATE_PATTERNS),
+        ("benes", _BENE_PATTERNS),
+        ("claims", _CLM_PATTERNS),
+        ("payment", _PYMT_PATTERNS),
+    ]
+    for rank, p in enumerate(patterns)
+}
 
-def _match_column(columns_lower: dict[str, str], patterns: list[str]) -> Optional[str]:
-    """Find the first matching column name from a list of known patterns.
+# Optional secondary NPI column consulted by Signal 1
+SERVICING_NPI_COL = "SERVICING_PROVIDER_NPI_NUM"
 
-    Args:
-        columns_lower: Mapping of lowercase column names to original column names.
-        patterns: List of lowercase patterns to match against.
+# Schema cache file written alongside the datasets
+_SCHEMA_CACHE_NAME = ".schema_cache.json"
 
-    Returns:
-        The original column name if a match is found, or None otherwise.
-    """
-    for p in patterns:
-        if p in columns_lower:
-            return columns_lower[p]
-    return None
+# Coalesce nearby column-chunk reads into large background range requests
+_PARQUET_SCAN_OPTIONS = pads.ParquetFragmentScanOptions(
+    pre_buffer=True,
+    use_buffered_stream=False,
+    cache_options=pa.CacheOptions(
+        hole_size_limit=64 * 1024,
+        range_size_limit=16 * 1024 * 1024,
+    ),
+)
 
 
 def detect_medicaid_columns(columns: list[str]) -> dict[str, str]:
@@ -60,20 +79,17 @@ def detect_medicaid_columns(columns: list[str]) -> dict[str, str]:
         A dict mapping standard aliases (npi, hcpcs, date, benes, claims,
         payment) to actual column names in the parquet file.
     """
-    cols_lower = {c.lower(): c for c in columns}
     mapping: dict[str, str] = {}
+    best_rank: dict[str, int] = {}
 
-    for alias, patterns in [
-        ("npi", _NPI_PATTERNS),
-        ("hcpcs", _HCPCS_PATTERNS),
-        ("date", _DATE_PATTERNS),
-        ("benes", _BENE_PATTERNS),
-        ("claims", _CLM_PATTERNS),
-        ("payment", _PYMT_PATTERNS),
-    ]:
-        match = _match_column(cols_lower, patterns)
-        if match:
-            mapping[alias] = match
+    for c in columns:
+        hit = _PATTERN_TO_ALIAS.get(c.lower())
+        if hit is None:
+            continue
+        alias, rank = hit
+        if rank < best_rank.get(alias, len(_PATTERN_TO_ALIAS)):
+            best_rank[alias] = rank
+            mapping[alias] = c
 
     # Fallback for 7-column files: assume positional order
     if len(mapping) < 6 and len(columns) == 7:
@@ -110,15 +126,199 @@ def normalize_npi(expr: pl.Expr) -> pl.Expr:
     return expr.cast(pl.Utf8).str.strip_chars().str.zfill(10)
 
 
+def parse_yyyymmdd(expr: pl.Expr) -> pl.Expr:
+    """Parse YYYYMMDD integers or strings into dates with integer arithmetic.
+
+    Year, month, and day are split off with integer division instead of a
+    formatted string parse. Values that are not a real calendar date (e.g.
+    the "00000000" placeholder or February 30) become null, matching a
+    non-strict strptime.
+
+    Args:
+        expr: A Polars expression holding YYYYMMDD values.
+
+    Returns:
+        A Polars Date expression.
+    """
+    n = expr.cast(pl.Int32, strict=False)
+    year, month, day = n // 10000, (n // 100) % 100, n % 100
+    ok = n.is_between(10000101, 99991231) & month.is_between(1, 12) & day.is_between(1, 31)
+    # Build from the first of the month so invalid days cannot raise; a day
+    # past the month's end rolls into the next month and is masked below.
+    first = pl.date(
+        pl.when(ok).then(year).otherwise(1970),
+        pl.when(ok).then(month).otherwise(1),
+        1,
+    )
+    date = first + pl.duration(days=pl.when(ok).then(day - 1).otherwise(0))
+    return pl.when(ok & (date.dt.month() == month)).then(date)
+
+
+def with_normalized_npi(lf: pl.LazyFrame, col: str) -> pl.LazyFrame:
+    """Attach the normalized NPI column "_npi" derived from ``col``.
+
+    Frames returned by load_medicaid() already carry "_npi" and map the npi
+    alias to it, in which case the frame is returned unchanged instead of
+    re-running the string kernels.
+
+    Args:
+        lf: Input LazyFrame.
+        col: Name of the raw NPI column, or "_npi" if already normalized.
+
+    Returns:
+        LazyFrame with a normalized "_npi" column.
+    """
+    if col == "_npi":
+        return lf
+    return lf.with_columns(normalize_npi(pl.col(col)).alias("_npi"))
+
+
+def nppes_with_npi(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Attach the normalized "_npi" column to an NPPES frame if missing.
+
+    load_nppes() stores "_npi" alongside the raw NPI column; frames built
+    elsewhere fall back to normalizing the "NPI" column.
+
+    Args:
+        lf: LazyFrame of NPPES registry data.
+
+    Returns:
+        LazyFrame with a normalized "_npi" column.
+    """
+    if "_npi" in lf.collect_schema():
+        return lf
+    return lf.with_columns(normalize_npi(pl.col("NPI")).alias("_npi"))
+
+
+def _cached_schema(path: str, compute: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+    """Look up inferred schema information for a data file in the on-disk cache.
+
+    Entries live in ".schema_cache.json" next to the data file and are keyed
+    by the file's absolute path, modification time, and size, so a replaced
+    or re-downloaded file is re-inferred automatically.
+
+    Args:
+        path: Path to the data file the schema describes.
+        compute: Callable that performs the inference on a cache miss.
+
+    Returns:
+        The cached (or freshly computed) JSON-serializable schema entry.
+    """
+    cache_file = os.path.join(os.path.dirname(path) or ".", _SCHEMA_CACHE_NAME)
+    st = os.stat(path)
+    stamp = [st.st_mtime_ns, st.st_size]
+    key = os.path.abspath(path)
+
+    entries: dict[str, Any] = {}
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+
+    entry = entries.get(key)
+    if entry and entry.get("stamp") == stamp:
+        return entry["value"]
+
+    value = compute()
+    entries[key] = {"stamp": stamp, "value": value}
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(entries, f, indent=2)
+    except OSError as e:
+        print(f"WARNING: Could not write schema cache {cache_file}: {e}")
+    return value
+
+
+def _schema_to_json(schema: pl.Schema) -> dict[str, str]:
+    """Serialize a Polars schema to a mapping of column name to dtype name."""
+    return {name: str(dtype) for name, dtype in schema.items()}
+
+
+def _schema_from_json(raw: dict[str, str]) -> dict[str, pl.DataType]:
+    """Rebuild a Polars schema from _schema_to_json() output.
+
+    Unrecognized dtype names fall back to Utf8, which every CSV column can
+    be read as.
+    """
+    return {name: getattr(pl, dtype, pl.Utf8) for name, dtype in raw.items()}
+
+
+def _arrow_cache_path(src_path: str) -> str:
+    """Return the Arrow IPC cache path that sits alongside a source file.
+
+    Args:
+        src_path: Path to the source CSV file.
+
+    Returns:
+        The source path with its extension replaced by ".arrow".
+    """
+    return os.path.splitext(src_path)[0] + ".arrow"
+
+
+def _cache_is_fresh(cache_path: str, src_path: str) -> bool:
+    """Check whether a cache file exists and is newer than its source.
+
+    Args:
+        cache_path: Path to the derived cache file.
+        src_path: Path to the source file the cache was built from.
+
+    Returns:
+        True if the cache exists and its mtime is not older than the source.
+    """
+    return (
+        os.path.exists(cache_path)
+        and os.path.getmtime(cache_path) >= os.path.getmtime(src_path)
+    )
+
+
+def _read_arrow_mmap(path: str) -> pl.DataFrame:
+    """Read an uncompressed Arrow IPC file through a memory map.
+
+    The OS pages in only the buffers that are touched, and the pages are
+    shared with the page cache instead of being copied into process memory.
+
+    Args:
+        path: Path to the Arrow IPC file.
+
+    Returns:
+        A DataFrame backed by the memory-mapped Arrow buffers.
+    """
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.RecordBatchFileReader(source).read_all()
+    return pl.from_arrow(table, rechunk=False)
+
+
+def _detect_parquet_schema(path: str) -> dict[str, Any]:
+    """Read the parquet footer and detect the Medicaid column mapping.
+
+    Args:
+        path: Path to the Medicaid parquet file.
+
+    Returns:
+        A dict with the file's column names ("columns") and the detected
+        alias mapping ("med_cols").
+    """
+    col_names = pq.read_schema(path).names
+    return {"columns": col_names, "med_cols": detect_medicaid_columns(col_names)}
+
+
 def load_medicaid(data_dir: Optional[str] = None) -> tuple[pl.LazyFrame, dict[str, str]]:
     """Load Medicaid provider spending data as a lazy frame.
 
+    The parquet file is memory-mapped and scanned through a PyArrow dataset
+    with pre-buffered reads, and the frame is projected down to the detected
+    columns so unused columns are never decoded.
+
     Args:
         data_dir: Directory containing the parquet file. Defaults to the
             FRAUD_DATA_DIR environment variable or "data".
 
     Returns:
-        A tuple of (LazyFrame of Medicaid data, column mapping dict).
+        A tuple of (LazyFrame of Medicaid data, column mapping dict). The NPI
+        column is normalized once here into "_npi", and the mapping's "npi"
+        alias points at it.
 
     Raises:
         FileNotFoundError: If the parquet file does not exist.
@@ -128,18 +328,41 @@ def load_medicaid(data_dir: Optional[str] = None) -> tuple[pl.LazyFrame, dict[st
     if not os.path.exists(path):
         raise FileNotFoundError(f"Medicaid data not found at {path}. Run setup.sh first.")
 
-    lf = pl.scan_parquet(path)
-    col_names = lf.collect_schema().names()
-    col_map = detect_medicaid_columns(col_names)
+    cached = _cached_schema(path, lambda: _detect_parquet_schema(path))
+    col_names: list[str] = cached["columns"]
+    col_map: dict[str, str] = cached["med_cols"]
     print(f"Medicaid data: {len(col_names)} columns, mapping: {col_map}")
-    return lf, col_map
+
+    dataset = pads.dataset(
+        path,
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+        format=pads.ParquetFileFormat(default_fragment_scan_options=_PARQUET_SCAN_OPTIONS),
+    )
+    raw_npi_col = col_map["npi"]
+    keep = [c for c in dict.fromkeys(col_map.values()) if c != raw_npi_col]
+    if SERVICING_NPI_COL in col_names and SERVICING_NPI_COL not in keep:
+        keep.append(SERVICING_NPI_COL)
+    lf = pl.scan_pyarrow_dataset(dataset).select(
+        normalize_npi(pl.col(raw_npi_col)).alias("_npi"), *keep
+    )
+    return lf, {**col_map, "npi": "_npi"}
+
+
+def _remove_partial(path: str) -> None:
+    """Delete a partially written cache file, ignoring errors."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 
 def load_leie(data_dir: Optional[str] = None) -> pl.DataFrame:
     """Load the OIG LEIE (List of Excluded Individuals/Entities).
 
     Parses exclusion and reinstatement dates from YYYYMMDD format and
-    normalizes NPI values to 10-digit zero-padded strings.
+    normalizes NPI values to 10-digit zero-padded strings. The parsed CSV is
+    cached as an Arrow IPC file next to the source and memory-mapped on
+    subsequent runs.
 
     Args:
         data_dir: Directory containing UPDATED.csv. Defaults to the
@@ -157,20 +380,34 @@ def load_leie(data_dir: Optional[str] = None) -> pl.DataFrame:
     if not os.path.exists(path):
         raise FileNotFoundError(f"LEIE data not found at {path}. Run setup.sh first.")
 
-    df = pl.read_csv(path, infer_schema_length=10000, ignore_errors=True)
+    cache_path = _arrow_cache_path(path)
+    if _cache_is_fresh(cache_path, path):
+        df = _read_arrow_mmap(cache_path)
+    else:
+        schema = _schema_from_json(_cached_schema(
+            path,
+            lambda: _schema_to_json(
+                pl.scan_csv(path, infer_schema_length=10000, ignore_errors=True)
+                .collect_schema()
+            ),
+        ))
+        df = pl.read_csv(path, schema=schema, ignore_errors=True)
+        try:
+            df.write_ipc(cache_path)
+        except OSError as e:
+            print(f"WARNING: Could not write LEIE cache {cache_path}: {e}")
+            _remove_partial(cache_path)
 
     # Parse exclusion dates (YYYYMMDD format)
     if "EXCLDATE" in df.columns:
         df = df.with_columns(
-            pl.col("EXCLDATE").cast(pl.Utf8).str.strptime(pl.Date, "%Y%m%d", strict=False)
-            .alias("excl_date_parsed")
+            parse_yyyymmdd(pl.col("EXCLDATE")).alias("excl_date_parsed")
         )
 
     # Parse reinstatement dates
     if "REINDATE" in df.columns:
         df = df.with_columns(
-            pl.col("REINDATE").cast(pl.Utf8).str.strptime(pl.Date, "%Y%m%d", strict=False)
-            .alias("rein_date_parsed")
+            parse_yyyymmdd(pl.col("REINDATE")).alias("rein_date_parsed")
         )
 
     # Normalize NPI
@@ -181,11 +418,85 @@ def load_leie(data_dir: Optional[str] = None) -> pl.DataFrame:
     return df
 
 
+def _nppes_schema(csv_path: str) -> pl.Schema:
+    """Return the NPPES CSV schema, inferred once and cached on disk."""
+    return _schema_from_json(_cached_schema(
+        csv_path,
+        lambda: _schema_to_json(
+            pl.scan_csv(csv_path, infer_schema_length=10000, ignore_errors=True)
+            .collect_schema()
+        ),
+    ))
+
+
+def _ensure_nppes_parquet(
+    csv_path: str, parquet_path: str, select_cols: list[str], schema: pl.Schema
+) -> bool:
+    """Convert the NPPES CSV to a projected, zstd-compressed parquet file once.
+
+    The conversion streams the CSV through Polars and keeps only the needed
+    columns, so later runs read a small columnar file instead of re-parsing
+    the multi-GB CSV. It is skipped while the parquet file is newer than the
+    CSV.
+
+    Args:
+        csv_path: Path to the extracted NPPES CSV file.
+        parquet_path: Destination path for the converted parquet file.
+        select_cols: Columns to keep, in output order.
+        schema: Schema of the CSV file, from _nppes_schema().
+
+    Returns:
+        True if the parquet file is ready, or False if it could not be
+        written.
+    """
+    if _cache_is_fresh(parquet_path, csv_path):
+        return True
+
+    print(f"Converting {csv_path} to {parquet_path} (one-time)...")
+    try:
+        (
+            pl.scan_csv(csv_path, schema=schema, ignore_errors=True)
+            .select(select_cols)
+            .pipe(nppes_with_npi)
+            .sink_parquet(parquet_path, compression="zstd")
+        )
+    except OSError as e:
+        print(f"WARNING: Could not write NPPES parquet {parquet_path}: {e}")
+        _remove_partial(parquet_path)
+        return False
+    return True
+
+
+def find_nppes_csv(data_dir: str) -> Optional[str]:
+    """Locate the extracted NPPES CSV file in a data directory.
+
+    Args:
+        data_dir: Directory to search.
+
+    Returns:
+        Path of the first matching CSV file, or None if there is none.
+    """
+    for pattern in [
+        os.path.join(data_dir, "npidata_pfile_*.csv"),
+        os.path.join(data_dir, "NPPES*.csv"),
+        os.path.join(data_dir, "*.csv"),
+    ]:
+        files = sorted(glob.glob(pattern))
+        # Exclude UPDATED.csv (LEIE data)
+        files = [f for f in files if "UPDATED" not in os.path.basename(f)]
+        if files:
+            return files[0]
+    return None
+
+
 def load_nppes(data_dir: Optional[str] = None) -> pl.LazyFrame:
     """Load the NPPES NPI registry with only the 11 required columns.
 
     Searches for the NPPES CSV file using multiple filename patterns and
-    selects only the columns needed for fraud signal analysis.
+    selects only the columns needed for fraud signal analysis. The projected
+    columns are converted once to "nppes.parquet" in the data directory and
+    scanned from there on subsequent runs. If the parquet file cannot be
+    written, the same columns are scanned from the CSV instead.
 
     Args:
         data_dir: Directory containing the NPPES CSV file. Defaults to the
@@ -199,25 +510,10 @@ def load_nppes(data_dir: Optional[str] = None) -> pl.LazyFrame:
         FileNotFoundError: If no NPPES CSV file is found.
     """
     ddir = data_dir or DATA_DIR
-
-    # Find the extracted CSV file
-    files: list[str] = []
-    for pattern in [
-        os.path.join(ddir, "npidata_pfile_*.csv"),
-        os.path.join(ddir, "NPPES*.csv"),
-        os.path.join(ddir, "*.csv"),
-    ]:
-        files = sorted(glob.glob(pattern))
-        # Exclude UPDATED.csv (LEIE data)
-        files = [f for f in files if "UPDATED" not in os.path.basename(f)]
-        if files:
-            break
-
-    if not files:
+    nppes_file = find_nppes_csv(ddir)
+    if nppes_file is None:
         raise FileNotFoundError(f"No NPPES data file found in {ddir}. Run setup.sh first.")
 
-    nppes_file = files[0]
-
     # The 11 columns required by the competition
     needed_cols = [
         "NPI",
@@ -233,16 +529,17 @@ def load_nppes(data_dir: Optional[str] = None) -> pl.LazyFrame:
         "Authorized Official Telephone Number",
     ]
 
-    lf = pl.scan_csv(nppes_file, infer_schema_length=10000, ignore_errors=True)
-
-    # Select only columns that exist in the file
-    available = set(lf.collect_schema().names())
-    select_cols = [c for c in needed_cols if c in available]
-
+    schema = _nppes_schema(nppes_file)
+    select_cols = [c for c in needed_cols if c in schema]
     if not select_cols:
-        print(f"WARNING: None of the expected NPPES columns found. Available: {lf.columns[:20]}...")
-        return lf
-
-    lf = lf.select(select_cols)
-    print(f"NPPES data: selected {len(select_cols)}/{len(needed_cols)} columns from {nppes_file}")
+        print(f"WARNING: None of the expected NPPES columns found. Available: {list(schema)[:20]}...")
+        return pl.scan_csv(nppes_file, schema=schema, ignore_errors=True)
+
+    parquet_path = os.path.join(ddir, "nppes.parquet")
+    if _ensure_nppes_parquet(nppes_file, parquet_path, select_cols, schema):
+        lf, source = pl.scan_parquet(parquet_path), parquet_path
+    else:
+        lf = pl.scan_csv(nppes_file, schema=schema, ignore_errors=True).select(select_cols)
+        source = nppes_file
+    print(f"NPPES data: selected {len(select_cols)}/{len(needed_cols)} columns from {source}")
     return lf
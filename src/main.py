@@ -7,12 +7,26 @@ writes the final JSON report.
 from __future__ import annotations
 
 import argparse
+import glob
+import hashlib
+import os
 import time
 import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
 
+import orjson
 import polars as pl
 
-from src.ingest import load_medicaid, load_leie, load_nppes, normalize_npi
+from src.ingest import (
+    find_nppes_csv,
+    load_leie,
+    load_medicaid,
+    load_nppes,
+    nppes_with_npi,
+    with_normalized_npi,
+)
 from src.signals import (
     signal_1_excluded_billing,
     signal_2_volume_outlier,
@@ -21,14 +35,24 @@ from src.signals import (
     signal_5_shared_official,
     signal_6_geographic_implausibility,
 )
-from src.output import build_provider_entry, build_report, write_report
+from src.output import build_provider_entry, build_report_header, write_report_streaming
+
+# Files whose contents determine a signal's flags; cached flags are keyed on them
+_SIGNAL_INPUTS = ("medicaid-provider-spending.parquet", "UPDATED.csv", "nppes.parquet")
+# Code whose changes can alter signal output: the signals and the loaders
+# that parse, normalize, and detect the columns they read
+_SIGNAL_SOURCES = tuple(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ("signals.py", "ingest.py")
+)
 
 
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments for the fraud detection pipeline.
 
     Returns:
-        Parsed arguments with data_dir, output, and no_gpu attributes.
+        Parsed arguments with data_dir, output, no_gpu, no_cache, and
+        streaming attributes.
     """
     parser = argparse.ArgumentParser(
         description="Medicaid Provider Fraud Signal Detection Engine"
@@ -45,6 +69,14 @@ def parse_args() -> argparse.Namespace:
         "--no-gpu", action="store_true",
         help="Disable GPU acceleration (no effect - included for compatibility)",
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Recompute every signal instead of reusing cached flags",
+    )
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="Run signal queries on the Polars streaming engine to bound memory",
+    )
     return parser.parse_args()
 
 
@@ -57,8 +89,9 @@ def enrich_flags_with_nppes(
     """Enrich flag entries with provider metadata from NPPES and lifetime billing.
 
     Looks up provider name, entity type, taxonomy, state, and enumeration date
-    from NPPES, and computes lifetime billing totals from Medicaid data. Groups
-    flags by NPI and builds complete provider entries.
+    from NPPES, and computes lifetime billing totals from Medicaid data. Both
+    lookups are joined onto the flagged NPIs in Polars, so Python only walks
+    the final per-provider rows to build complete provider entries.
 
     Args:
         flags: List of raw signal flag dicts (with npi, signal_id, details).
@@ -69,112 +102,228 @@ def enrich_flags_with_nppes(
     Returns:
         List of enriched provider entry dicts ready for the final report.
     """
+    return list(iter_enriched_flags(flags, nppes_lf, medicaid_lf, med_cols))
+
+
+def iter_enriched_flags(
+    flags: list[dict],
+    nppes_lf: pl.LazyFrame,
+    medicaid_lf: pl.LazyFrame,
+    med_cols: dict[str, str],
+) -> Iterator[dict]:
+    """Yield enriched provider entries one at a time.
+
+    Generator form of enrich_flags_with_nppes(), used to stream entries
+    straight into the report file. One entry is yielded per unique flagged
+    NPI, in first-flagged order.
+
+    Args:
+        flags: List of raw signal flag dicts (with npi, signal_id, details).
+        nppes_lf: Lazy frame of NPPES registry data.
+        medicaid_lf: Lazy frame of Medicaid provider spending data.
+        med_cols: Column name mapping from detect_medicaid_columns().
+
+    Yields:
+        Enriched provider entry dicts ready for the final report.
+    """
     if not flags:
-        return []
+        return
 
     npi_col = med_cols["npi"]
     payment_col = med_cols["payment"]
     claims_col = med_cols["claims"]
     bene_col = med_cols["benes"]
 
-    # Collect unique NPIs from all flags
-    flag_npis = list({f["npi"] for f in flags})
-
-    # Get NPPES metadata
-    nppes_meta = (
-        nppes_lf
-        .with_columns(normalize_npi(pl.col("NPI")).alias("_npi"))
-        .filter(pl.col("_npi").is_in(flag_npis))
-        .collect()
+    # Group flags by NPI; the keys double as the provider row order
+    npi_flags: defaultdict[str, list[dict]] = defaultdict(list)
+    for f in flags:
+        npi_flags[f["npi"]].append(f)
+
+    # Flagged NPIs as a small frame driving semi-joins against the big tables
+    flag_npis = pl.DataFrame({"_npi": list(npi_flags)}, schema={"_npi": pl.Utf8}).lazy()
+
+    nppes = nppes_with_npi(nppes_lf)
+    nppes_schema = nppes.collect_schema()
+
+    def _text(name: str) -> pl.Expr:
+        if name in nppes_schema:
+            return pl.col(name).cast(pl.Utf8)
+        return pl.lit(None, dtype=pl.Utf8)
+
+    is_individual = _text("Entity Type Code") == "1"
+
+    # NPPES metadata for flagged NPIs (one row per NPI), shaped into output fields
+    nppes_meta_lf = (
+        nppes
+        .join(flag_npis, on="_npi", how="semi")
+        .unique(subset=["_npi"], keep="last")
+        .select([
+            "_npi",
+            pl.when(is_individual)
+            .then(
+                pl.concat_str(
+                    [_text("Provider Last Name (Legal Name)"), _text("Provider First Name")],
+                    separator=" ",
+                    ignore_nulls=True,
+                ).str.strip_chars()
+            )
+            .otherwise(_text("Provider Organization Name (Legal Business Name)"))
+            .alias("provider_name"),
+            pl.when(is_individual)
+            .then(pl.lit("individual"))
+            .otherwise(pl.lit("organization"))
+            .alias("entity_type"),
+            _text("Healthcare Provider Taxonomy Code_1").alias("taxonomy_code"),
+            _text("Provider Business Practice Location Address State Name").alias("state"),
+            _text("Provider Enumeration Date").alias("enumeration_date"),
+        ])
     )
 
-    # Build NPI -> metadata lookup
-    meta_map: dict[str, dict[str, str]] = {}
-    for row in nppes_meta.iter_rows(named=True):
-        npi = row["_npi"]
-        entity_type = str(row.get("Entity Type Code", ""))
-        if entity_type == "1":
-            name = f"{row.get('Provider Last Name (Legal Name)', '')} {row.get('Provider First Name', '')}".strip()
-        else:
-            name = str(row.get("Provider Organization Name (Legal Business Name)", ""))
-        meta_map[npi] = {
-            "provider_name": name or "Unknown",
-            "entity_type": "individual" if entity_type == "1" else "organization",
-            "taxonomy_code": str(row.get("Healthcare Provider Taxonomy Code_1", "")),
-            "state": str(row.get("Provider Business Practice Location Address State Name", "")),
-            "enumeration_date": str(row.get("Provider Enumeration Date", "")),
-        }
-
-    # Get lifetime billing per NPI (including beneficiaries)
-    lifetime = (
-        medicaid_lf
-        .with_columns(normalize_npi(pl.col(npi_col)).alias("_npi"))
-        .filter(pl.col("_npi").is_in(flag_npis))
+    # Lifetime billing per NPI (including beneficiaries)
+    lifetime_lf = (
+        with_normalized_npi(medicaid_lf, npi_col)
+        .join(flag_npis, on="_npi", how="semi")
         .group_by("_npi")
         .agg([
-            pl.col(payment_col).sum().alias("lifetime_paid"),
-            pl.col(claims_col).sum().alias("lifetime_claims"),
-            pl.col(bene_col).sum().alias("lifetime_benes"),
+            pl.col(payment_col).sum().cast(pl.Float64).alias("lifetime_paid"),
+            pl.col(claims_col).sum().cast(pl.Int64).alias("lifetime_claims"),
+            pl.col(bene_col).sum().cast(pl.Int64).alias("lifetime_benes"),
         ])
-        .collect()
     )
 
-    billing_map: dict[str, dict[str, float | int]] = {}
-    for row in lifetime.iter_rows(named=True):
-        billing_map[row["_npi"]] = {
-            "lifetime_paid": float(row["lifetime_paid"]),
-            "lifetime_claims": int(row["lifetime_claims"]),
-            "lifetime_benes": int(row["lifetime_benes"]),
-        }
+    # Join both lookups onto the flagged NPIs in one plan; Polars runs the
+    # NPPES and Medicaid branches concurrently and the streaming engine keeps
+    # the group-by memory bounded
+    providers = (
+        flag_npis
+        .join(nppes_meta_lf, on="_npi", how="left", maintain_order="left")
+        .join(lifetime_lf, on="_npi", how="left", maintain_order="left")
+        .with_columns([
+            pl.when(pl.col("entity_type").is_null())
+            .then(pl.lit("unknown"))
+            .otherwise(pl.col("entity_type"))
+            .alias("entity_type"),
+            pl.when(pl.col("provider_name").fill_null("") == "")
+            .then(pl.lit("Unknown"))
+            .otherwise(pl.col("provider_name"))
+            .alias("provider_name"),
+            pl.col("taxonomy_code", "state", "enumeration_date").fill_null(""),
+            pl.col("lifetime_paid").fill_null(0.0),
+            pl.col("lifetime_claims", "lifetime_benes").fill_null(0),
+        ])
+        .collect(engine="streaming")
+    )
 
-    # Merge flags by NPI to build provider entries
-    npi_flags: dict[str, list[dict]] = {}
-    for f in flags:
-        npi_flags.setdefault(f["npi"], []).append(f)
-
-    enriched: list[dict] = []
-    for npi, npi_flag_list in npi_flags.items():
-        meta = meta_map.get(npi, {
-            "provider_name": "Unknown",
-            "entity_type": "unknown",
-            "taxonomy_code": "",
-            "state": "",
-            "enumeration_date": "",
-        })
-        billing = billing_map.get(npi, {
-            "lifetime_paid": 0.0,
-            "lifetime_claims": 0,
-            "lifetime_benes": 0,
-        })
+    for row in providers.iter_rows(named=True):
+        npi = row["_npi"]
+        npi_flag_list = npi_flags[npi]
 
         # Enrich Signal 6 state field if missing
         for f in npi_flag_list:
             if f["signal_id"] == 6 and not f["details"].get("state"):
-                f["details"]["state"] = meta["state"]
+                f["details"]["state"] = row["state"]
 
-        entry = build_provider_entry(
+        yield build_provider_entry(
             npi=npi,
-            provider_name=meta["provider_name"],
-            entity_type=meta["entity_type"],
-            taxonomy_code=meta["taxonomy_code"],
-            state=meta["state"],
-            enumeration_date=meta["enumeration_date"],
-            lifetime_paid=billing["lifetime_paid"],
-            lifetime_claims=billing["lifetime_claims"],
-            lifetime_benes=billing["lifetime_benes"],
+            provider_name=row["provider_name"],
+            entity_type=row["entity_type"],
+            taxonomy_code=row["taxonomy_code"],
+            state=row["state"],
+            enumeration_date=row["enumeration_date"],
+            lifetime_paid=row["lifetime_paid"],
+            lifetime_claims=row["lifetime_claims"],
+            lifetime_benes=row["lifetime_benes"],
             signals=npi_flag_list,
         )
-        enriched.append(entry)
 
-    return enriched
+
+def _timed_run(runner: Callable[[], list[dict]]) -> tuple[list[dict], float]:
+    """Run a signal and measure its wall time.
+
+    Args:
+        runner: Zero-argument callable returning the signal's flag list.
+
+    Returns:
+        A tuple of (flags, elapsed seconds).
+    """
+    t = time.time()
+    flags = runner()
+    return flags, time.time() - t
+
+
+def _signal_cache_path(data_dir: str, signal_name: str) -> str:
+    """Build the flag cache path for a signal from its input file versions.
+
+    The key hashes the size and modification time of each input dataset,
+    including the NPPES CSV that nppes.parquet is converted from (and that
+    signals read directly when the conversion fails), and of the signal and
+    ingest sources, so any change to them misses the cache.
+
+    Args:
+        data_dir: Directory containing the datasets.
+        signal_name: Signal identifier such as "signal_1".
+
+    Returns:
+        Path of the JSON cache file under data_dir/.cache.
+    """
+    parts = [signal_name]
+    paths = [os.path.join(data_dir, name) for name in _SIGNAL_INPUTS]
+    nppes_csv = find_nppes_csv(data_dir)
+    if nppes_csv is not None:
+        paths.append(nppes_csv)
+    paths += _SIGNAL_SOURCES
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except FileNotFoundError:
+            parts.append(f"{path}:missing")
+    key = hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    return os.path.join(data_dir, ".cache", f"{signal_name}-{key}.json")
+
+
+def _cached_signal(cache_path: str, runner: Callable[[], list[dict]]) -> list[dict]:
+    """Return a signal's cached flags, or run it and cache the result.
+
+    Failed runs raise before anything is written, so only successful signals
+    are reused. Stale caches for the same signal are removed on write. If the
+    cache cannot be written (read-only or full data directory), the computed
+    flags are still returned.
+
+    Args:
+        cache_path: Path from _signal_cache_path().
+        runner: Zero-argument callable returning the signal's flag list.
+
+    Returns:
+        The signal's list of flag dicts.
+    """
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    flags = runner()
+
+    cache_dir = os.path.dirname(cache_path)
+    signal_name = os.path.basename(cache_path).rsplit("-", 1)[0]
+    tmp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(cache_dir, f"{signal_name}-*.json")):
+            os.remove(stale)
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(flags, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        print(f"  WARNING: Could not cache {signal_name} flags: {exc}")
+    return flags
 
 
 def main() -> None:
     """Run the full fraud detection pipeline.
 
     Orchestrates data loading, signal detection, result enrichment, and
-    report generation. Each signal runs independently with error isolation
-    so that a failure in one signal does not prevent others from completing.
+    report generation. Signals run concurrently with error isolation so that
+    a failure in one signal does not prevent others from completing.
     """
     args = parse_args()
     data_dir = args.data_dir
@@ -185,28 +334,26 @@ def main() -> None:
     print("=" * 60)
     start_time = time.time()
 
+    if args.streaming:
+        # Makes every plain .collect() prefer the streaming engine, so the
+        # signal aggregations process the Medicaid scan in batches
+        pl.Config.set_engine_affinity("streaming")
+
     # Load data
-    print("\n[1/4] Loading datasets...")
+    print("\n[1/3] Loading datasets...")
     t = time.time()
-    medicaid_lf, med_cols = load_medicaid(data_dir)
-    leie_df = load_leie(data_dir)
-    nppes_lf = load_nppes(data_dir)
+    # The three loaders do independent I/O and parsing, so overlap them
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        medicaid_future = executor.submit(load_medicaid, data_dir)
+        leie_future = executor.submit(load_leie, data_dir)
+        nppes_future = executor.submit(load_nppes, data_dir)
+    medicaid_lf, med_cols = medicaid_future.result()
+    leie_df = leie_future.result()
+    nppes_lf = nppes_future.result()
     print(f"  Data loaded in {time.time() - t:.1f}s")
 
-    # Count total providers scanned
-    print("\n[2/4] Counting unique providers...")
-    t = time.time()
-    npi_col = med_cols["npi"]
-    scan_count = (
-        medicaid_lf
-        .select(pl.col(npi_col).n_unique())
-        .collect()
-        .item()
-    )
-    print(f"  {scan_count:,} unique providers in {time.time() - t:.1f}s")
-
     # Run all signals
-    print("\n[3/4] Running fraud signal detection...")
+    print("\n[2/3] Running fraud signal detection...")
     all_flags: list[dict] = []
     signal_tallies: dict[str, int] = {}
 
@@ -219,36 +366,62 @@ def main() -> None:
         ("signal_6", lambda: signal_6_geographic_implausibility(medicaid_lf, med_cols)),
     ]
 
-    for signal_name, runner in signal_runners:
-        t = time.time()
-        print(f"\n  Running {signal_name}...")
-        try:
-            flags = runner()
-            signal_tallies[signal_name] = len(flags)
-            all_flags.extend(flags)
-            print(f"  {signal_name}: {len(flags)} flags in {time.time() - t:.1f}s")
-        except Exception as e:
-            print(f"  ERROR in {signal_name}: {e}")
-            traceback.print_exc()
+    if not args.no_cache:
+        signal_runners = [
+            (
+                signal_name,
+                lambda path=_signal_cache_path(data_dir, signal_name), runner=runner:
+                    _cached_signal(path, runner),
+            )
+            for signal_name, runner in signal_runners
+        ]
+
+    # Polars releases the GIL while executing a plan, so the independent
+    # signal pipelines and the provider count run side by side on the shared
+    # thread pool instead of the count costing its own serial pass.
+    npi_col = med_cols["npi"]
+    print(f"\n  Running {len(signal_runners)} signals concurrently...")
+    with ThreadPoolExecutor(max_workers=len(signal_runners) + 1) as executor:
+        count_future = executor.submit(
+            lambda: medicaid_lf.select(pl.col(npi_col).n_unique()).collect().item()
+        )
+        futures = {
+            signal_name: executor.submit(_timed_run, runner)
+            for signal_name, runner in signal_runners
+        }
+
+    for signal_name, future in futures.items():
+        exc = future.exception()
+        if exc is not None:
+            print(f"  ERROR in {signal_name}: {exc}")
+            traceback.print_exception(exc)
             signal_tallies[signal_name] = 0
+            continue
+        flags, elapsed = future.result()
+        signal_tallies[signal_name] = len(flags)
+        all_flags.extend(flags)
+        print(f"  {signal_name}: {len(flags)} flags in {elapsed:.1f}s")
+
+    scan_count = count_future.result()
+    print(f"  {scan_count:,} unique providers scanned")
 
     # Enrich and build report
-    print("\n[4/4] Building report...")
+    print("\n[3/3] Building report...")
     t = time.time()
-    enriched = enrich_flags_with_nppes(all_flags, nppes_lf, medicaid_lf, med_cols)
-
-    report = build_report(
-        flagged_providers=enriched,
-        scan_count=scan_count,
-        signal_tallies=signal_tallies,
+    # Entries are built and serialized one at a time; the header only needs
+    # the provider count, which is the number of unique flagged NPIs
+    flagged_count = len({f["npi"] for f in all_flags})
+    header = build_report_header(scan_count, signal_tallies, flagged_count)
+    write_report_streaming(
+        header,
+        iter_enriched_flags(all_flags, nppes_lf, medicaid_lf, med_cols),
+        output_path,
     )
 
-    write_report(report, output_path)
-
     elapsed = time.time() - start_time
     print(f"\nCompleted in {elapsed:.1f}s")
     print(f"Total flags: {len(all_flags)}")
-    print(f"Unique providers flagged: {len(enriched)}")
+    print(f"Unique providers flagged: {flagged_count}")
 
 
 if __name__ == "__main__":
@@ -6,9 +6,11 @@ relevance mappings for each flagged provider.
 """
 from __future__ import annotations
 
-import json
+import math
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Iterable
+
+import orjson
 
 from src import __version__
 
@@ -23,6 +25,11 @@ SIGNAL_TYPES: dict[int, str] = {
     6: "geographic_implausibility",
 }
 
+# (report signal_counts key, signal tally key) pairs in signal order
+_SIGNAL_COUNT_KEYS: tuple[tuple[str, str], ...] = tuple(
+    (name, f"signal_{sig_id}") for sig_id, name in SIGNAL_TYPES.items()
+)
+
 # FCA statute mappings per signal -- most specific applicable subsection
 FCA_STATUTES: dict[int, str] = {
     1: "31 U.S.C. \u00a73729(a)(1)(A); 42 U.S.C. \u00a71320a-7b(f)",
@@ -147,6 +154,55 @@ NEXT_STEPS: dict[int, list[str]] = {
 
 # Severity ranking for FCA materiality: critical > high > medium > low
 _SEVERITY_RANK: dict[str, int] = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+_severity_rank = _SEVERITY_RANK.__getitem__
+
+# Shared stand-in for flags without details; read-only, never mutated
+_NO_DETAILS: dict = {}
+
+
+def _severity_signal_1(details: dict) -> str:
+    # Excluded provider billing is a per se FCA violation -- no materiality
+    # defense is available; any post-exclusion claim is automatically false
+    return "critical"
+
+
+def _severity_signal_2(details: dict) -> str:
+    # >5x peer median is strong materiality indicator per CMS program integrity guidance
+    return "high" if details.get("ratio_to_peer_median", 0) > 5 else "medium"
+
+
+def _severity_signal_3(details: dict) -> str:
+    # >500% growth in bust-out pattern is highly material; CMS enrollment
+    # revocation threshold under 42 CFR 424.535(a)(8) for abuse of billing
+    return "high" if details.get("peak_growth_rate", 0) > 500 else "medium"
+
+
+def _severity_signal_4(details: dict) -> str:
+    # Physically impossible claim volumes constitute strong evidence of
+    # fabricated records -- inherently material under Escobar standard
+    return "high"
+
+
+def _severity_signal_5(details: dict) -> str:
+    # >$5M combined across shell entities meets DOJ civil fraud threshold
+    # for priority investigation per DOJ Civil Fraud Initiative guidelines
+    return "high" if details.get("combined_total", 0) > 5_000_000 else "medium"
+
+
+def _severity_signal_6(details: dict) -> str:
+    # Extremely low beneficiary ratio (<0.05) is strong phantom billing indicator
+    return "high" if details.get("ratio", 1.0) < 0.05 else "medium"
+
+
+# Per-signal severity rules, looked up once per signal instead of an if-chain
+_SEVERITY_FNS: dict[int, Callable[[dict], str]] = {
+    1: _severity_signal_1,
+    2: _severity_signal_2,
+    3: _severity_signal_3,
+    4: _severity_signal_4,
+    5: _severity_signal_5,
+    6: _severity_signal_6,
+}
 
 
 def classify_severity(signal_id: int, details: dict) -> str:
@@ -168,39 +224,55 @@ def classify_severity(signal_id: int, details: dict) -> str:
     Returns:
         Severity level string: "critical", "high", or "medium".
     """
-    if signal_id == 1:
-        # Excluded provider billing is a per se FCA violation -- no materiality
-        # defense is available; any post-exclusion claim is automatically false
-        return "critical"
+    fn = _SEVERITY_FNS.get(signal_id)
+    return fn(details) if fn is not None else "medium"
 
-    if signal_id == 2:
-        ratio = details.get("ratio_to_peer_median", 0)
-        # >5x peer median is strong materiality indicator per CMS program integrity guidance
-        return "high" if ratio > 5 else "medium"
 
-    if signal_id == 3:
-        growth = details.get("peak_growth_rate", 0)
-        # >500% growth in bust-out pattern is highly material; CMS enrollment
-        # revocation threshold under 42 CFR 424.535(a)(8) for abuse of billing
-        return "high" if growth > 500 else "medium"
+def _overpayment_signal_1(details: dict) -> float:
+    return float(details.get("post_exclusion_paid", 0))
 
-    if signal_id == 4:
-        # Physically impossible claim volumes constitute strong evidence of
-        # fabricated records -- inherently material under Escobar standard
-        return "high"
 
-    if signal_id == 5:
-        combined = details.get("combined_total", 0)
-        # >$5M combined across shell entities meets DOJ civil fraud threshold
-        # for priority investigation per DOJ Civil Fraud Initiative guidelines
-        return "high" if combined > 5_000_000 else "medium"
+def _overpayment_signal_2(details: dict) -> float:
+    total = details.get("total_paid", 0)
+    threshold = details.get("p99_threshold", 0)
+    return max(0.0, float(total - threshold))
 
-    if signal_id == 6:
-        ratio = details.get("ratio", 1.0)
-        # Extremely low beneficiary ratio (<0.05) is strong phantom billing indicator
-        return "high" if ratio < 0.05 else "medium"
 
-    return "medium"
+def _overpayment_signal_3(details: dict) -> float:
+    return float(details.get("payments_during_growth", 0))
+
+
+def _overpayment_signal_4(details: dict) -> float:
+    # (peak_claims - 1056) * (peak_paid / peak_claims), floored at 0
+    peak_claims = details.get("claims_count", 0)
+    if peak_claims <= 0:
+        return 0.0
+    peak_paid = details.get("peak_month_revenue", 0)
+    excess = max(0, peak_claims - (6 * 8 * 22))
+    return max(0.0, float(excess * (peak_paid / peak_claims)))
+
+
+def _overpayment_signal_5(details: dict) -> float:
+    # Conservative estimate: excess above $1M threshold across controlled entities
+    combined = details.get("combined_total", 0)
+    return max(0.0, float(combined - 1_000_000))
+
+
+def _overpayment_signal_6(details: dict) -> float:
+    # Excess claims beyond the expected 0.1 beneficiary ratio are identifiable,
+    # but there is no per-claim cost data to price them reliably
+    return 0.0
+
+
+# Per-signal overpayment formulas, keyed like _SEVERITY_FNS
+_OVERPAYMENT_FNS: dict[int, Callable[[dict], float]] = {
+    1: _overpayment_signal_1,
+    2: _overpayment_signal_2,
+    3: _overpayment_signal_3,
+    4: _overpayment_signal_4,
+    5: _overpayment_signal_5,
+    6: _overpayment_signal_6,
+}
 
 
 def estimate_overpayment(signal_id: int, details: dict) -> float:
@@ -214,44 +286,8 @@ def estimate_overpayment(signal_id: int, details: dict) -> float:
         Estimated overpayment in USD. Returns 0.0 for signals where
         overpayment is not directly estimable from the available data.
     """
-    if signal_id == 1:
-        return float(details.get("post_exclusion_paid", 0))
-
-    if signal_id == 2:
-        total = details.get("total_paid", 0)
-        threshold = details.get("p99_threshold", 0)
-        return max(0.0, float(total - threshold))
-
-    if signal_id == 3:
-        return float(details.get("payments_during_growth", 0))
-
-    if signal_id == 4:
-        # (peak_claims - 1056) * (peak_paid / peak_claims), floored at 0
-        peak_claims = details.get("claims_count", 0)
-        peak_paid = details.get("peak_month_revenue", 0)
-        excess = max(0, peak_claims - (6 * 8 * 22))
-        if peak_claims > 0:
-            return max(0.0, float(excess * (peak_paid / peak_claims)))
-        return 0.0
-
-    if signal_id == 5:
-        # Conservative estimate: excess above $1M threshold across controlled entities
-        combined = details.get("combined_total", 0)
-        return max(0.0, float(combined - 1_000_000))
-
-    if signal_id == 6:
-        # Conservative estimate based on excess claims beyond expected ratio
-        claims = details.get("claims", 0)
-        unique_benes = details.get("unique_beneficiaries", 0)
-        ratio = details.get("ratio", 1.0)
-        if claims > 0 and ratio < 0.1:
-            # Expected claims at 0.1 ratio = unique_benes / 0.1
-            expected_claims = unique_benes * 10
-            excess_claims = max(0, claims - expected_claims)
-            # Estimate per-claim cost from total (rough average)
-            return 0.0  # Cannot reliably estimate without per-claim cost data
-
-    return 0.0
+    fn = _OVERPAYMENT_FNS.get(signal_id)
+    return fn(details) if fn is not None else 0.0
 
 
 def build_provider_entry(
@@ -270,6 +306,8 @@ def build_provider_entry(
 
     Aggregates all signals for a provider, computes severity and overpayment
     for each, and attaches FCA relevance based on the most severe signal.
+    Metadata values are stored as given, so callers pass native Python
+    values of the annotated types.
 
     Args:
         npi: 10-digit National Provider Identifier.
@@ -287,68 +325,62 @@ def build_provider_entry(
         A dict matching the competition JSON schema with provider metadata,
         signal entries, estimated overpayment, and FCA relevance.
     """
-    signal_entries: list[dict] = []
-    total_overpayment = 0.0
-
-    for sig in signals:
-        sig_id = sig["signal_id"]
-        details = sig.get("details", {})
-        severity = classify_severity(sig_id, details)
-        overpayment = estimate_overpayment(sig_id, details)
-        total_overpayment += overpayment
-
-        signal_entries.append({
-            "signal_type": SIGNAL_TYPES[sig_id],
+    details_list = [sig.get("details") or _NO_DETAILS for sig in signals]
+    scores = [
+        (
+            classify_severity(sig["signal_id"], details),
+            estimate_overpayment(sig["signal_id"], details),
+        )
+        for sig, details in zip(signals, details_list)
+    ]
+
+    signal_entries = [
+        {
+            "signal_type": SIGNAL_TYPES[sig["signal_id"]],
             "severity": severity,
             "evidence": details,
-        })
+        }
+        for sig, details, (severity, _) in zip(signals, details_list, scores)
+    ]
+    scored = [(severity, sig) for sig, (severity, _) in zip(signals, scores)]
+    total_overpayment = math.fsum(overpayment for _, overpayment in scores)
 
     return {
-        "npi": str(npi),
-        "provider_name": str(provider_name),
-        "entity_type": str(entity_type).lower(),
-        "taxonomy_code": str(taxonomy_code),
-        "state": str(state),
-        "enumeration_date": str(enumeration_date),
-        "total_paid_all_time": round(float(lifetime_paid), 2),
-        "total_claims_all_time": int(lifetime_claims),
-        "total_unique_beneficiaries_all_time": int(lifetime_benes),
+        "npi": npi,
+        "provider_name": provider_name,
+        "entity_type": entity_type,
+        "taxonomy_code": taxonomy_code,
+        "state": state,
+        "enumeration_date": enumeration_date,
+        "total_paid_all_time": round(lifetime_paid, 2),
+        "total_claims_all_time": lifetime_claims,
+        "total_unique_beneficiaries_all_time": lifetime_benes,
         "signals": signal_entries,
         "estimated_overpayment_usd": round(total_overpayment, 2),
-        "fca_relevance": _build_fca_relevance(signals),
+        "fca_relevance": _build_fca_relevance(scored),
     }
 
 
-def _build_fca_relevance(signals: list[dict]) -> dict:
+def _build_fca_relevance(scored_signals: list[tuple[str, dict]]) -> dict:
     """Build FCA relevance block from the MOST SEVERE signal.
 
     Selects the signal with the highest severity classification to drive
     the FCA analysis, ensuring the strongest legal theory is presented.
-    Severity ranking: critical > high > medium > low.
+    Severity ranking: critical > high > medium > low. Ties keep the earliest
+    signal.
 
     Args:
-        signals: List of signal flag dicts for a provider.
+        scored_signals: (severity, signal flag dict) pairs for a provider, as
+            already classified by build_provider_entry().
 
     Returns:
         A dict with claim_type, statute_reference, and suggested_next_steps,
         or an empty dict if no signals are provided.
     """
-    if not signals:
+    if not scored_signals:
         return {}
 
-    # Find the most severe signal by classifying each and ranking
-    best_sig = signals[0]
-    best_rank = _SEVERITY_RANK.get(
-        classify_severity(best_sig["signal_id"], best_sig.get("details", {})), 0
-    )
-
-    for sig in signals[1:]:
-        rank = _SEVERITY_RANK.get(
-            classify_severity(sig["signal_id"], sig.get("details", {})), 0
-        )
-        if rank > best_rank:
-            best_rank = rank
-            best_sig = sig
+    _, best_sig = max(scored_signals, key=lambda p: _severity_rank(p[0]))
 
     sig_id = best_sig["signal_id"]
     return {
@@ -358,6 +390,32 @@ def _build_fca_relevance(signals: list[dict]) -> dict:
     }
 
 
+def build_report_header(
+    scan_count: int,
+    signal_tallies: dict[str, int],
+    flagged_count: int,
+) -> dict:
+    """Assemble the report metadata that precedes the flagged providers array.
+
+    Args:
+        scan_count: Total number of unique providers scanned.
+        signal_tallies: Mapping of signal names (e.g. "signal_1") to flag counts.
+        flagged_count: Number of flagged providers in the report.
+
+    Returns:
+        The report dict without its "flagged_providers" key.
+    """
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "tool_version": __version__,
+        "total_providers_scanned": scan_count,
+        "total_providers_flagged": flagged_count,
+        "signal_counts": {
+            name: signal_tallies.get(key, 0) for name, key in _SIGNAL_COUNT_KEYS
+        },
+    }
+
+
 def build_report(
     flagged_providers: list[dict],
     scan_count: int,
@@ -376,18 +434,7 @@ def build_report(
         metadata, signal counts, and the flagged providers array.
     """
     return {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "tool_version": __version__,
-        "total_providers_scanned": scan_count,
-        "total_providers_flagged": len(flagged_providers),
-        "signal_counts": {
-            "excluded_provider": signal_tallies.get("signal_1", 0),
-            "billing_outlier": signal_tallies.get("signal_2", 0),
-            "rapid_escalation": signal_tallies.get("signal_3", 0),
-            "workforce_impossibility": signal_tallies.get("signal_4", 0),
-            "shared_official": signal_tallies.get("signal_5", 0),
-            "geographic_implausibility": signal_tallies.get("signal_6", 0),
-        },
+        **build_report_header(scan_count, signal_tallies, len(flagged_providers)),
         "flagged_providers": flagged_providers,
     }
 
@@ -395,22 +442,74 @@ def build_report(
 def write_report(report: dict, path: str) -> None:
     """Write the report dict to a JSON file.
 
+    Serialization uses orjson, which is several times faster than the stdlib
+    encoder for large flagged-provider arrays and natively encodes dates,
+    datetimes, and numpy scalars.
+
     Args:
         report: The complete report dict from build_report().
         path: File path to write the JSON output to.
     """
-    with open(path, "w") as f:
-        json.dump(report, f, indent=2, default=_json_serializer)
-    print(f"Report written to {path}")
-    print(f"  Providers flagged: {report['total_providers_flagged']}")
-    print(f"  Signal counts: {report['signal_counts']}")
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(
+            report,
+            default=_json_serializer,
+            option=(
+                orjson.OPT_INDENT_2
+                | orjson.OPT_APPEND_NEWLINE
+                | orjson.OPT_SERIALIZE_NUMPY
+            ),
+        ))
+    _print_write_summary(report, path)
+
+
+def write_report_streaming(header: dict, providers: Iterable[dict], path: str) -> int:
+    """Write the report to a JSON file one provider entry at a time.
+
+    Produces the same bytes as write_report() for the equivalent report, but
+    only one serialized provider is held in memory at a time, so the full
+    flagged_providers list never has to be materialized.
+
+    Args:
+        header: Report metadata from build_report_header().
+        providers: Provider entry dicts, e.g. a generator over
+            build_provider_entry() results.
+        path: File path to write the JSON output to.
+
+    Returns:
+        The number of provider entries written.
+    """
+    option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    head = orjson.dumps(header, default=_json_serializer, option=option)
+    count = 0
+    with open(path, "wb") as f:
+        # Reopen the header object and append the array as its last key
+        f.write(head[:-2] + b',\n  "flagged_providers": [')
+        for provider in providers:
+            body = orjson.dumps(provider, default=_json_serializer, option=option)
+            f.write(b",\n    " if count else b"\n    ")
+            f.write(body.replace(b"\n", b"\n    "))
+            count += 1
+        f.write(b"\n  ]\n}\n" if count else b"]\n}\n")
+    _print_write_summary(header, path)
+    return count
+
+
+def _print_write_summary(report: dict, path: str) -> None:
+    """Print the post-write summary lines as a single stdout write."""
+    print(
+        f"Report written to {path}\n"
+        f"  Providers flagged: {report['total_providers_flagged']}\n"
+        f"  Signal counts: {report['signal_counts']}"
+    )
 
 
 def _json_serializer(obj: Any) -> Any:
-    """Handle non-JSON-serializable types during report serialization.
+    """Handle types the JSON encoder cannot serialize natively.
 
-    Converts date/datetime objects to ISO format strings and numpy/polars
-    scalar types to native Python types.
+    orjson already encodes dates, datetimes, and numpy scalars itself, so
+    this fallback is only reached for the remaining scalar types (e.g.
+    polars) and date-like objects it does not recognize.
 
     Args:
         obj: The object that failed default JSON serialization.
@@ -6,75 +6,191 @@ dictionaries containing the provider NPI, signal ID, and evidence details.
 """
 from __future__ import annotations
 
-from datetime import date as dt_date
+import threading
+import weakref
+from typing import Callable, Optional
 
 import polars as pl
 
-from src.ingest import normalize_npi
+from src.ingest import (
+    SERVICING_NPI_COL,
+    normalize_npi,
+    nppes_with_npi,
+    with_normalized_npi,
+)
 
 # Home health HCPCS codes for Signal 6
-HOME_HEALTH_CODES: set[str] = set()
-for prefix, start, end in [
-    ("G", 151, 162),
-    ("G", 299, 300),
-    ("S", 9122, 9124),
-    ("T", 1019, 1022),
-]:
-    for n in range(start, end + 1):
-        HOME_HEALTH_CODES.add(f"{prefix}{n:04d}")
-
-
-def _to_date_col(lf: pl.LazyFrame, col: str) -> pl.LazyFrame:
-    """Attempt to cast a column to Date type if not already.
+HOME_HEALTH_CODES: frozenset[str] = frozenset(
+    f"{prefix}{n:04d}"
+    for prefix, start, end in [
+        ("G", 151, 162),
+        ("G", 299, 300),
+        ("S", 9122, 9124),
+        ("T", 1019, 1022),
+    ]
+    for n in range(start, end + 1)
+)
+_HH_CODES = pl.Series("hcpcs", sorted(HOME_HEALTH_CODES), dtype=pl.Utf8)
+
+
+# (pattern, strptime format, append "-01") for the date layouts _to_date_col parses
+_DATE_FORMATS: list[tuple[str, str, bool]] = [
+    (r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d", False),
+    (r"^\d{8}$", "%Y%m%d", False),
+    (r"^\d{2}/\d{2}/\d{4}$", "%m/%d/%Y", False),
+    (r"^\d{4}-\d{2}$", "%Y-%m-%d", True),
+]
+_DATE_SAMPLE_ROWS = 1000
+
+# Inferred date layout per (LazyFrame, column); keyed by id() and guarded by a
+# weak reference since LazyFrames are not hashable, with a check lock per column
+_DATE_FORMAT_CACHE: dict[
+    int,
+    tuple[weakref.ref, dict[str, Optional[int]], dict[str, threading.Lock]],
+] = {}
+_DATE_FORMAT_LOCK = threading.Lock()
+
+# Aggregates shared between signals (see _shared_aggregate()), cached like
+# _DATE_FORMAT_CACHE with a build lock per aggregate
+_SHARED_AGG_CACHE: dict[
+    int,
+    tuple[
+        weakref.ref,
+        dict[tuple[str, ...], pl.DataFrame],
+        dict[tuple[str, ...], threading.Lock],
+    ],
+] = {}
+_SHARED_AGG_LOCK = threading.Lock()
+
+
+def _infer_date_format(lf: pl.LazyFrame, col: str) -> Optional[int]:
+    """Find the single date layout used by a string date column.
+
+    Samples the first non-null values to pick the layout they all match,
+    then checks that layout against the whole column so rows in another
+    layout fall back to per-row parsing. Results are cached per LazyFrame
+    object; signals running concurrently on a shared frame wait for the
+    first check instead of repeating it.
 
-    Handles multiple date formats including YYYY-MM-DD, YYYYMMDD, MM/DD/YYYY,
-    and YYYY-MM (appends "-01" to make a valid date).
+    Args:
+        lf: Input LazyFrame.
+        col: Name of the date column.
+
+    Returns:
+        Index into _DATE_FORMATS, or None if the sample is empty, mixes
+        layouts, or some non-null row does not parse with the sampled layout.
+    """
+    with _DATE_FORMAT_LOCK:
+        key = id(lf)
+        entry = _DATE_FORMAT_CACHE.get(key)
+        if entry is None or entry[0]() is not lf:
+            entry = (
+                weakref.ref(lf, lambda _, k=key: _DATE_FORMAT_CACHE.pop(k, None)),
+                {},
+                {},
+            )
+            _DATE_FORMAT_CACHE[key] = entry
+        formats, locks = entry[1], entry[2]
+        if col in formats:
+            return formats[col]
+        lock = locks.setdefault(col, threading.Lock())
+
+    with lock:
+        if col not in formats:
+            formats[col] = _detect_date_format(lf, col)
+        return formats[col]
+
+
+def _detect_date_format(lf: pl.LazyFrame, col: str) -> Optional[int]:
+    """Scan a string date column for the layout _infer_date_format() caches.
 
     Args:
         lf: Input LazyFrame.
-        col: Name of the column to cast.
+        col: Name of the date column.
 
     Returns:
-        LazyFrame with the specified column cast to Date type, or unchanged
-        if the column is already a date type or does not exist.
+        Index into _DATE_FORMATS, or None if no single layout parses every
+        non-null row.
     """
-    schema = lf.collect_schema()
-    if col not in schema:
-        return lf
-    dtype = schema[col]
-    if dtype == pl.Date or dtype == pl.Datetime:
-        return lf
-    # Try parsing common formats, including YYYY-MM (append -01)
-    return lf.with_columns(
-        pl.coalesce([
-            pl.col(col).cast(pl.Utf8).str.strptime(pl.Date, "%Y-%m-%d", strict=False),
-            pl.col(col).cast(pl.Utf8).str.strptime(pl.Date, "%Y%m%d", strict=False),
-            pl.col(col).cast(pl.Utf8).str.strptime(pl.Date, "%m/%d/%Y", strict=False),
-            # YYYY-MM format: append "-01" and parse
-            (pl.col(col).cast(pl.Utf8) + "-01").str.strptime(pl.Date, "%Y-%m-%d", strict=False),
-        ]).alias(col)
+    sample = (
+        lf.select(pl.col(col).cast(pl.Utf8))
+        .drop_nulls()
+        .head(_DATE_SAMPLE_ROWS)
+        .collect()
+        .to_series()
     )
+    found: Optional[int] = None
+    if not sample.is_empty():
+        for i, (pattern, _, _) in enumerate(_DATE_FORMATS):
+            if sample.str.contains(pattern).all():
+                found = i
+                break
+
+    # The sample only nominates a layout; confirm it parses every non-null
+    # row so values in another layout further down are never dropped
+    if found is not None:
+        text = pl.col(col).cast(pl.Utf8)
+        unparsed = (
+            lf.select((text.is_not_null() & _parse_date(text, found).is_null()).any())
+            .collect()
+            .item()
+        )
+        if unparsed:
+            found = None
+    return found
+
 
+def _parse_date(text: pl.Expr, fmt_idx: int) -> pl.Expr:
+    """Parse a string expression with one entry of _DATE_FORMATS.
 
-def _extract_year_month(lf: pl.LazyFrame, col: str) -> pl.LazyFrame:
-    """Add a year_month column derived from a date or string column.
+    Args:
+        text: Utf8 expression holding the date strings.
+        fmt_idx: Index into _DATE_FORMATS.
+
+    Returns:
+        Date expression, null where the value does not match the layout.
+    """
+    _, fmt, month_only = _DATE_FORMATS[fmt_idx]
+    source = text + "-01" if month_only else text
+    return source.str.strptime(pl.Date, fmt, strict=False)
+
+
+def _to_date_col(
+    lf: pl.LazyFrame, col: str, dtype: Optional[pl.DataType] = None
+) -> pl.LazyFrame:
+    """Attempt to cast a column to Date type if not already.
+
+    Handles multiple date formats including YYYY-MM-DD, YYYYMMDD, MM/DD/YYYY,
+    and YYYY-MM (appends "-01" to make a valid date). When every value
+    in the column parses with one layout, only that format is parsed;
+    otherwise every format is tried per row.
 
     Args:
         lf: Input LazyFrame.
-        col: Name of the source date/string column.
+        col: Name of the column to cast.
+        dtype: The column's dtype if the caller already resolved the schema;
+            looked up from ``lf`` when omitted.
 
     Returns:
-        LazyFrame with an additional "year_month" column in "YYYY-MM" format.
+        LazyFrame with the specified column cast to Date type, or unchanged
+        if the column is already a date type or does not exist.
     """
-    schema = lf.collect_schema()
-    dtype = schema.get(col)
+    if dtype is None:
+        schema = lf.collect_schema()
+        if col not in schema:
+            return lf
+        dtype = schema[col]
     if dtype == pl.Date or dtype == pl.Datetime:
-        return lf.with_columns(
-            pl.col(col).dt.strftime("%Y-%m").alias("year_month")
-        )
-    # Might be integer YYYYMM or string like "2024-07"
+        return lf
+
+    text = pl.col(col).cast(pl.Utf8)
+    fmt_idx = _infer_date_format(lf, col)
+    if fmt_idx is not None:
+        return lf.with_columns(_parse_date(text, fmt_idx).alias(col))
+
+    # Mixed or unknown layouts: try parsing each format, including YYYY-MM (append -01)
     return lf.with_columns(
-        pl.col(col).cast(pl.Utf8).str.slice(0, 7).alias("year_month")
+        pl.coalesce([_parse_date(text, i) for i in range(len(_DATE_FORMATS))]).alias(col)
     )
 
 
@@ -95,6 +211,126 @@ def _filter_valid_npi(lf: pl.LazyFrame, npi_alias: str = "_npi") -> pl.LazyFrame
     )
 
 
+def _shared_aggregate(
+    lf: pl.LazyFrame,
+    key: tuple[str, ...],
+    build: Callable[[], pl.DataFrame],
+) -> pl.DataFrame:
+    """Return an aggregate of ``lf``, building it at most once per frame.
+
+    Signals run concurrently, so a signal asking for an aggregate that another
+    signal is already building waits for that result instead of scanning the
+    input again.
+
+    Args:
+        lf: Input LazyFrame the aggregate is derived from.
+        key: Identifies the aggregate, including the columns it reads.
+        build: Computes the aggregate when it is not cached yet.
+
+    Returns:
+        The cached or newly built DataFrame.
+    """
+    with _SHARED_AGG_LOCK:
+        frame_key = id(lf)
+        entry = _SHARED_AGG_CACHE.get(frame_key)
+        if entry is None or entry[0]() is not lf:
+            entry = (
+                weakref.ref(lf, lambda _, k=frame_key: _SHARED_AGG_CACHE.pop(k, None)),
+                {},
+                {},
+            )
+            _SHARED_AGG_CACHE[frame_key] = entry
+        results, locks = entry[1], entry[2]
+        if key in results:
+            return results[key]
+        lock = locks.setdefault(key, threading.Lock())
+
+    with lock:
+        if key not in results:
+            results[key] = build()
+        return results[key]
+
+
+def _npi_payment_totals(
+    medicaid_lf: pl.LazyFrame, med_cols: dict[str, str]
+) -> pl.DataFrame:
+    """Sum Medicaid payments per valid NPI, shared by Signals 2 and 5.
+
+    Args:
+        medicaid_lf: Lazy frame of Medicaid provider spending data.
+        med_cols: Column name mapping from detect_medicaid_columns().
+
+    Returns:
+        DataFrame with "_npi" and "total_paid" columns.
+    """
+    npi_col = med_cols["npi"]
+    payment_col = med_cols["payment"]
+
+    return _shared_aggregate(
+        medicaid_lf,
+        ("npi_totals", npi_col, payment_col),
+        lambda: (
+            medicaid_lf
+            .pipe(with_normalized_npi, npi_col)
+            .pipe(_filter_valid_npi)
+            .group_by("_npi")
+            .agg(pl.col(payment_col).sum().alias("total_paid"))
+            .collect()
+        ),
+    )
+
+
+def _monthly_npi_totals(
+    medicaid_lf: pl.LazyFrame, med_cols: dict[str, str]
+) -> pl.DataFrame:
+    """Aggregate Medicaid billing per NPI and month, shared by Signals 3 and 4.
+
+    Parses dates, normalizes and validates NPIs, and sums payments and claims
+    per NPI and calendar month. The result is small next to the raw rows.
+
+    Args:
+        medicaid_lf: Lazy frame of Medicaid provider spending data.
+        med_cols: Column name mapping from detect_medicaid_columns().
+
+    Returns:
+        DataFrame with "_npi", "year_month", "monthly_paid", and
+        "monthly_claims" columns.
+    """
+    npi_col = med_cols["npi"]
+    date_col = med_cols["date"]
+    payment_col = med_cols["payment"]
+    claims_col = med_cols["claims"]
+
+    def build() -> pl.DataFrame:
+        date_dtype = medicaid_lf.collect_schema().get(date_col)
+        med = _to_date_col(medicaid_lf, date_col, date_dtype)
+        med = with_normalized_npi(med, npi_col)
+        med = _filter_valid_npi(med)
+        # Group on the month as a date key and format "YYYY-MM" once per
+        # aggregated row rather than once per claim line
+        return (
+            med
+            .group_by(["_npi", pl.col(date_col).dt.truncate("1mo").alias("month_start")])
+            .agg([
+                pl.col(payment_col).sum().alias("monthly_paid"),
+                pl.col(claims_col).sum().alias("monthly_claims"),
+            ])
+            .select([
+                "_npi",
+                pl.col("month_start").dt.strftime("%Y-%m").alias("year_month"),
+                "monthly_paid",
+                "monthly_claims",
+            ])
+            .collect()
+        )
+
+    return _shared_aggregate(
+        medicaid_lf,
+        ("monthly_totals", npi_col, date_col, payment_col, claims_col),
+        build,
+    )
+
+
 def signal_1_excluded_billing(
     medicaid_lf: pl.LazyFrame,
     med_cols: dict[str, str],
@@ -133,6 +369,13 @@ def signal_1_excluded_billing(
         pl.col("excl_date_parsed").alias("excl_date"),
         pl.col("EXCLTYPE").cast(pl.Utf8).alias("excl_type"),
     ])
+    # One row per NPI, keeping its earliest exclusion, so the join below
+    # cannot fan out a provider's claim lines across repeated LEIE records
+    excluded = (
+        excluded
+        .sort("excl_date")
+        .unique(subset="excl_npi", keep="first", maintain_order=True)
+    )
 
     if excluded.is_empty():
         print("  Signal 1: No excluded providers with NPIs found in LEIE")
@@ -141,75 +384,96 @@ def signal_1_excluded_billing(
     print(f"  Signal 1: {len(excluded)} excluded providers (no reinstatement) to check")
 
     # Build Medicaid frame with both billing and servicing NPI
-    med = _to_date_col(medicaid_lf, date_col)
-
-    # Check for SERVICING_PROVIDER_NPI_NUM column
     schema = medicaid_lf.collect_schema()
-    has_servicing = "SERVICING_PROVIDER_NPI_NUM" in schema.names()
+    med = (
+        _to_date_col(medicaid_lf, date_col, schema.get(date_col))
+        .filter(pl.col(date_col).is_not_null())
+    )
 
-    # Helper: run exclusion check against a single NPI column
-    def _check_npi_col(
-        source: pl.LazyFrame, npi_src_col: str
-    ) -> pl.DataFrame:
-        return (
-            source
-            .with_columns(normalize_npi(pl.col(npi_src_col)).alias("_npi"))
-            .pipe(_filter_valid_npi)
-            .filter(pl.col(date_col).is_not_null())
-            .join(excluded.lazy(), left_on="_npi", right_on="excl_npi")
-            .filter(pl.col(date_col) > pl.col("excl_date"))
-            .group_by("_npi")
-            .agg([
-                pl.col(payment_col).sum().alias("post_exclusion_paid"),
-                pl.col(claims_col).sum().alias("post_exclusion_claims"),
-                pl.col("excl_date").first(),
-                pl.col("excl_type").first(),
-                pl.col(date_col).min().alias("first_post_excl_billing"),
-                pl.col(date_col).max().alias("last_post_excl_billing"),
-            ])
-            .filter(pl.col("post_exclusion_paid") > 0)
-            .collect()
-        )
+    # Check for SERVICING_PROVIDER_NPI_NUM column
+    has_servicing = SERVICING_NPI_COL in schema
 
-    # Check billing NPI
-    billing_result = _check_npi_col(med, npi_col)
+    excluded_npis = excluded["excl_npi"].implode()
 
-    # Also check servicing NPI if available, then merge
+    # One row per (claim line, NPI source): both NPI columns are normalized
+    # and stacked by a single unpivot, so the Medicaid frame is scanned once
+    value_cols = [date_col, payment_col, claims_col]
+    npi_sources = {"billing": npi_col}
     if has_servicing:
-        servicing_result = _check_npi_col(med, "SERVICING_PROVIDER_NPI_NUM")
-        # Merge: combine results, taking max per NPI
-        result = (
-            pl.concat([billing_result, servicing_result])
-            .group_by("_npi")
-            .agg([
-                pl.col("post_exclusion_paid").sum().alias("post_exclusion_paid"),
-                pl.col("post_exclusion_claims").sum().alias("post_exclusion_claims"),
-                pl.col("excl_date").first(),
-                pl.col("excl_type").first(),
-                pl.col("first_post_excl_billing").min(),
-                pl.col("last_post_excl_billing").max(),
-            ])
+        npi_sources["servicing"] = SERVICING_NPI_COL
+    stacked = (
+        med
+        .select(value_cols + [
+            (pl.col(col) if col == "_npi" else normalize_npi(pl.col(col))).alias(source)
+            for source, col in npi_sources.items()
+        ])
+        # Only claim lines touching an excluded NPI can match the join below;
+        # dropping the rest first keeps the unpivot to a tiny fraction of rows
+        .filter(pl.any_horizontal([
+            pl.col(source).is_in(excluded_npis) for source in npi_sources
+        ]))
+        .unpivot(
+            index=value_cols,
+            on=list(npi_sources),
+            variable_name="npi_source",
+            value_name="_npi",
         )
-    else:
-        result = billing_result
+        .pipe(_filter_valid_npi)
+    )
+
+    # Totals per NPI and source; each source must show positive post-exclusion
+    # billing on its own before the sources are merged per NPI
+    per_source = (
+        stacked
+        .join(excluded.lazy(), left_on="_npi", right_on="excl_npi")
+        .filter(pl.col(date_col) > pl.col("excl_date"))
+        .group_by(["_npi", "npi_source"])
+        .agg([
+            pl.col(payment_col).sum().alias("post_exclusion_paid"),
+            pl.col(claims_col).sum().alias("post_exclusion_claims"),
+            pl.col("excl_date").first(),
+            pl.col("excl_type").first(),
+            pl.col(date_col).min().alias("first_post_excl_billing"),
+            pl.col(date_col).max().alias("last_post_excl_billing"),
+        ])
+        .filter(pl.col("post_exclusion_paid") > 0)
+    )
+
+    result = (
+        per_source
+        .group_by("_npi")
+        .agg([
+            pl.col("post_exclusion_paid").sum(),
+            pl.col("post_exclusion_claims").sum(),
+            pl.col("excl_date").first(),
+            pl.col("excl_type").first(),
+            pl.col("first_post_excl_billing").min(),
+            pl.col("last_post_excl_billing").max(),
+        ])
+        .collect()
+    )
 
     print(f"  Signal 1: {len(result)} providers billing after exclusion")
 
-    flags: list[dict] = []
-    for row in result.iter_rows(named=True):
-        flags.append({
-            "npi": row["_npi"],
+    return [
+        {
+            "npi": npi,
             "signal_id": 1,
             "details": {
-                "exclusion_date": str(row["excl_date"]),
-                "exclusion_type": row["excl_type"],
-                "post_exclusion_paid": float(row["post_exclusion_paid"]),
-                "post_exclusion_claims": int(row["post_exclusion_claims"]),
-                "first_post_excl_billing": str(row["first_post_excl_billing"]),
-                "last_post_excl_billing": str(row["last_post_excl_billing"]),
+                "exclusion_date": str(excl_date),
+                "exclusion_type": excl_type,
+                "post_exclusion_paid": float(paid),
+                "post_exclusion_claims": int(claims),
+                "first_post_excl_billing": str(first_billing),
+                "last_post_excl_billing": str(last_billing),
             },
-        })
-    return flags
+        }
+        for npi, excl_date, excl_type, paid, claims, first_billing, last_billing
+        in result.select([
+            "_npi", "excl_date", "excl_type", "post_exclusion_paid",
+            "post_exclusion_claims", "first_post_excl_billing", "last_post_excl_billing",
+        ]).iter_rows()
+    ]
 
 
 def signal_2_volume_outlier(
@@ -233,22 +497,11 @@ def signal_2_volume_outlier(
         "details" with total_paid, peer_median, p99_threshold,
         ratio_to_peer_median, taxonomy, and state.
     """
-    npi_col = med_cols["npi"]
-    payment_col = med_cols["payment"]
-
-    # Aggregate total payment per NPI, filtering invalid NPIs
-    npi_totals = (
-        medicaid_lf
-        .with_columns(normalize_npi(pl.col(npi_col)).alias("_npi"))
-        .pipe(_filter_valid_npi)
-        .group_by("_npi")
-        .agg(pl.col(payment_col).sum().alias("total_paid"))
-    )
+    # Total payment per valid NPI, shared with Signal 5
+    npi_totals = _npi_payment_totals(medicaid_lf, med_cols).lazy()
 
     # Get taxonomy and state from NPPES
-    nppes = nppes_lf.with_columns(
-        normalize_npi(pl.col("NPI")).alias("_npi")
-    ).select([
+    nppes = nppes_with_npi(nppes_lf).select([
         "_npi",
         pl.col("Healthcare Provider Taxonomy Code_1").alias("taxonomy"),
         pl.col("Provider Business Practice Location Address State Name").alias("state"),
@@ -257,23 +510,23 @@ def signal_2_volume_outlier(
     # Join
     joined = npi_totals.join(nppes, on="_npi", how="inner")
 
-    # Calculate 99th percentile and median per peer group
-    peer_stats = (
-        joined
-        .group_by(["taxonomy", "state"])
-        .agg([
-            pl.col("total_paid").quantile(0.99, interpolation="linear").alias("p99_threshold"),
-            pl.col("total_paid").median().alias("peer_median"),
-            pl.col("total_paid").count().alias("peer_count"),
-        ])
-        .filter(pl.col("peer_count") >= 5)
-    )
-
-    # Find outliers
+    # Peer statistics as windows over (taxonomy, state), so providers are
+    # compared in place instead of joining aggregated stats back; providers
+    # without a taxonomy or state have no peer group
+    peer = ["taxonomy", "state"]
     outliers = (
         joined
-        .join(peer_stats, on=["taxonomy", "state"], how="inner")
-        .filter(pl.col("total_paid") > pl.col("p99_threshold"))
+        .filter(pl.col("taxonomy").is_not_null() & pl.col("state").is_not_null())
+        .with_columns([
+            pl.col("total_paid").quantile(0.99, interpolation="linear").over(peer)
+                .alias("p99_threshold"),
+            pl.col("total_paid").median().over(peer).alias("peer_median"),
+            pl.col("total_paid").count().over(peer).alias("peer_count"),
+        ])
+        .filter(
+            (pl.col("peer_count") >= 5)
+            & (pl.col("total_paid") > pl.col("p99_threshold"))
+        )
         .with_columns(
             (pl.col("total_paid") / pl.col("peer_median")).alias("ratio_to_median")
         )
@@ -282,21 +535,24 @@ def signal_2_volume_outlier(
 
     print(f"  Signal 2: {len(outliers)} billing volume outliers")
 
-    flags: list[dict] = []
-    for row in outliers.iter_rows(named=True):
-        flags.append({
-            "npi": row["_npi"],
+    return [
+        {
+            "npi": npi,
             "signal_id": 2,
             "details": {
-                "total_paid": float(row["total_paid"]),
-                "peer_median": float(row["peer_median"]),
-                "p99_threshold": float(row["p99_threshold"]),
-                "ratio_to_peer_median": round(float(row["ratio_to_median"]), 2),
-                "taxonomy": row["taxonomy"],
-                "state": row["state"],
+                "total_paid": float(total_paid),
+                "peer_median": float(peer_median),
+                "p99_threshold": float(p99),
+                "ratio_to_peer_median": round(float(ratio), 2),
+                "taxonomy": taxonomy,
+                "state": state,
             },
-        })
-    return flags
+        }
+        for npi, total_paid, peer_median, p99, ratio, taxonomy, state in outliers.select([
+            "_npi", "total_paid", "peer_median", "p99_threshold", "ratio_to_median",
+            "taxonomy", "state",
+        ]).iter_rows()
+    ]
 
 
 def signal_3_rapid_escalation(
@@ -321,46 +577,28 @@ def signal_3_rapid_escalation(
         twelve_month_progression, peak_growth_rate, and
         payments_during_growth.
     """
-    npi_col = med_cols["npi"]
-    date_col = med_cols["date"]
-    payment_col = med_cols["payment"]
-
-    # Normalize and extract year-month
-    med = medicaid_lf.with_columns(
-        normalize_npi(pl.col(npi_col)).alias("_npi")
-    )
-    med = _filter_valid_npi(med)
-    med = _to_date_col(med, date_col)
-    med = _extract_year_month(med, date_col)
-
-    # Monthly totals per NPI
+    # Monthly totals per NPI, shared with Signal 4
     monthly = (
-        med
-        .group_by(["_npi", "year_month"])
-        .agg(pl.col(payment_col).sum().alias("monthly_paid"))
+        _monthly_npi_totals(medicaid_lf, med_cols)
+        .lazy()
+        .select(["_npi", "year_month", "monthly_paid"])
         .sort(["_npi", "year_month"])
     )
 
-    # Get enumeration dates from NPPES
-    nppes = nppes_lf.with_columns(
-        normalize_npi(pl.col("NPI")).alias("_npi")
-    ).select([
-        "_npi",
-        pl.col("Provider Enumeration Date").alias("enum_date_str"),
-    ])
-
-    # Join to get enumeration date and parse it
-    joined = (
-        monthly
-        .join(nppes, on="_npi", how="inner")
-        .with_columns(
-            pl.col("enum_date_str").cast(pl.Utf8).str.strptime(
+    # Enumeration dates from NPPES, parsed once per NPI before the join
+    nppes = (
+        nppes_with_npi(nppes_lf)
+        .select([
+            "_npi",
+            pl.col("Provider Enumeration Date").cast(pl.Utf8).str.strptime(
                 pl.Date, "%m/%d/%Y", strict=False
-            ).alias("enum_date")
-        )
+            ).alias("enum_date"),
+        ])
         .filter(pl.col("enum_date").is_not_null())
     )
 
+    joined = monthly.join(nppes, on="_npi", how="inner")
+
     # First billing month per NPI
     first_billing = (
         joined
@@ -371,70 +609,61 @@ def signal_3_rapid_escalation(
         ])
     )
 
-    # Collect first_billing to filter new providers
-    first_df = first_billing.collect()
-
-    # Filter to new providers: enumeration within 24 months of first billing
-    new_providers: set[str] = set()
-    first_map: dict[str, str] = {}
-    enum_map: dict[str, object] = {}
-    for row in first_df.iter_rows(named=True):
-        npi = row["_npi"]
-        first_map[npi] = row["first_billing_month"]
-        if row["enum_date"] is not None and row["first_billing_month"] is not None:
-            enum_map[npi] = row["enum_date"]
-            first_ym = row["first_billing_month"]
-            try:
-                ym_parts = first_ym.split("-")
-                first_date = dt_date(int(ym_parts[0]), int(ym_parts[1]), 1)
-                diff_months = (first_date.year - row["enum_date"].year) * 12 + \
-                              (first_date.month - row["enum_date"].month)
-                if 0 <= diff_months <= 24:
-                    new_providers.add(npi)
-            except (ValueError, TypeError, IndexError):
-                pass
-
-    print(f"  Signal 3: {len(new_providers)} newly enumerated providers to check")
-
-    if not new_providers:
-        return []
+    # New providers: enumeration within 24 months before first billing
+    first_date = (pl.col("first_billing_month") + "-01").str.strptime(
+        pl.Date, "%Y-%m-%d", strict=False
+    )
+    months_since_enum = (
+        (first_date.dt.year() - pl.col("enum_date").dt.year()) * 12
+        + (first_date.dt.month().cast(pl.Int32) - pl.col("enum_date").dt.month().cast(pl.Int32))
+    )
+    new_providers = (
+        first_billing
+        .filter(months_since_enum.is_between(0, 24))
+        .select(["_npi", "enum_date", "first_billing_month"])
+    )
 
-    # Filter to new providers, limit to first 12 months, and compute growth
-    new_monthly = joined.filter(
-        pl.col("_npi").is_in(list(new_providers))
-    ).collect().sort(["_npi", "year_month"])
+    # Both plans share the NPPES join and enumeration date parsing;
+    # collecting them together lets Polars evaluate that subplan once.
+    new_df, new_monthly = pl.collect_all([
+        new_providers,
+        joined.join(new_providers.select("_npi"), on="_npi", how="semi"),
+    ])
+
+    print(f"  Signal 3: {len(new_df)} newly enumerated providers to check")
 
-    # Keep only first 12 months per NPI
+    if new_df.is_empty():
+        return []
+
+    # Limit new providers to their first 12 months and compute growth; rows
+    # are in month order, so a per-NPI row counter gives the month rank
     new_monthly = (
         new_monthly
-        .with_columns(
-            pl.col("year_month").rank("ordinal").over("_npi").alias("_month_rank")
-        )
-        .filter(pl.col("_month_rank") <= 12)
-        .drop("_month_rank")
+        .filter(pl.col("year_month").is_not_null())
+        .sort(["_npi", "year_month"])
+        .filter(pl.int_range(pl.len()).over("_npi") < 12)
     )
 
-    # Vectorized MoM growth calculation
+    # MoM growth and its rolling 3-month average in one linear pass over the
+    # sorted rows; a lagged row only counts when it belongs to the same NPI,
+    # which matches per-NPI windows without grouping. Each 3-month mean is
+    # summed directly rather than from a running sum, so it carries no
+    # floating-point drift from earlier months.
+    same_npi_1 = pl.col("_npi") == pl.col("_npi").shift(1)
+    same_npi_2 = pl.col("_npi") == pl.col("_npi").shift(2)
+    prev_paid = pl.when(same_npi_1).then(pl.col("monthly_paid").shift(1))
+    growth = pl.col("mom_growth")
     growth_df = (
         new_monthly
-        .with_columns([
-            pl.col("monthly_paid").shift(1).over("_npi").alias("prev_paid"),
-        ])
         .with_columns(
-            pl.when(pl.col("prev_paid") > 0)
-            .then((pl.col("monthly_paid") - pl.col("prev_paid")) / pl.col("prev_paid") * 100)
+            pl.when(prev_paid > 0)
+            .then((pl.col("monthly_paid") - prev_paid) / prev_paid * 100)
             .otherwise(None)
             .alias("mom_growth")
         )
-    )
-
-    # Compute rolling 3-month average growth rate per NPI
-    growth_df = (
-        growth_df
         .with_columns(
-            pl.col("mom_growth")
-            .rolling_mean(window_size=3, min_samples=3)
-            .over("_npi")
+            pl.when(same_npi_2)
+            .then((growth.shift(2) + growth.shift(1) + growth) / 3)
             .alias("rolling_3m_avg_growth")
         )
     )
@@ -454,26 +683,42 @@ def signal_3_rapid_escalation(
         .filter(pl.col("peak_growth_rate") > 200)
     )
 
-    # Build 12-month progressions
-    flags: list[dict] = []
-    for row in flagged.iter_rows(named=True):
-        npi = row["_npi"]
-        npi_data = growth_df.filter(pl.col("_npi") == npi).sort("year_month")
-        months = npi_data["year_month"].to_list()
-        payments = npi_data["monthly_paid"].to_list()
-        progression = {months[i]: float(payments[i]) for i in range(min(12, len(months)))}
+    # Build 12-month progressions for all flagged providers in one pass
+    progressions = (
+        growth_df
+        .sort(["_npi", "year_month"])
+        .group_by("_npi")
+        .agg([
+            pl.col("year_month").head(12).alias("months"),
+            pl.col("monthly_paid").head(12).alias("payments"),
+        ])
+    )
+    flagged = (
+        flagged
+        .join(new_df, on="_npi", how="left")
+        .join(progressions, on="_npi", how="left")
+    )
 
-        flags.append({
+    flags = [
+        {
             "npi": npi,
             "signal_id": 3,
             "details": {
-                "enumeration_date": str(enum_map.get(npi, "")),
-                "first_billing_month": first_map.get(npi, ""),
-                "twelve_month_progression": progression,
-                "peak_growth_rate": round(float(row["peak_growth_rate"]), 1),
-                "payments_during_growth": round(float(row["payments_during_growth"]), 2),
+                "enumeration_date": str(enum_date),
+                "first_billing_month": first_month,
+                "twelve_month_progression": {
+                    month: float(paid) for month, paid in zip(months, payments)
+                },
+                "peak_growth_rate": round(float(peak), 1),
+                "payments_during_growth": round(float(growth_paid), 2),
             },
-        })
+        }
+        for npi, enum_date, first_month, months, payments, peak, growth_paid
+        in flagged.select([
+            "_npi", "enum_date", "first_billing_month", "months", "payments",
+            "peak_growth_rate", "payments_during_growth",
+        ]).iter_rows()
+    ]
 
     print(f"  Signal 3: {len(flags)} providers with rapid escalation (>200% rolling 3-month avg)")
     return flags
@@ -500,77 +745,64 @@ def signal_4_workforce_impossibility(
         "details" with peak_month, claims_count, implied_claims_per_hour,
         and peak_month_revenue.
     """
-    npi_col = med_cols["npi"]
-    date_col = med_cols["date"]
-    claims_col = med_cols["claims"]
-    payment_col = med_cols["payment"]
-
     HOURS_PER_MONTH = 22 * 8  # 176 business hours
     THRESHOLD = 6  # claims per provider-hour per spec
 
     # Only organizations (Entity Type Code = "2")
     org_npis = (
-        nppes_lf
+        nppes_with_npi(nppes_lf)
         .filter(
             pl.col("Entity Type Code").is_not_null()
             & (pl.col("Entity Type Code").cast(pl.Utf8) == "2")
         )
-        .with_columns(normalize_npi(pl.col("NPI")).alias("_npi"))
         .select("_npi")
     )
 
-    # Normalize and extract year-month from Medicaid
-    med = medicaid_lf.with_columns(
-        normalize_npi(pl.col(npi_col)).alias("_npi")
-    )
-    med = _filter_valid_npi(med)
-    med = _to_date_col(med, date_col)
-    med = _extract_year_month(med, date_col)
-
-    # Monthly claims per org NPI
+    # Monthly claims per org NPI, from the totals shared with Signal 3
     monthly = (
-        med
-        .join(org_npis, on="_npi", how="inner")
-        .group_by(["_npi", "year_month"])
-        .agg([
-            pl.col(claims_col).sum().alias("monthly_claims"),
-            pl.col(payment_col).sum().alias("monthly_revenue"),
-        ])
+        _monthly_npi_totals(medicaid_lf, med_cols)
+        .lazy()
+        .join(org_npis, on="_npi", how="semi")
+        .rename({"monthly_paid": "monthly_revenue"})
+        # claims / HOURS_PER_MONTH > THRESHOLD, kept in claim units so only
+        # months that can be a flagged peak reach the sort below
+        .filter(pl.col("monthly_claims") > THRESHOLD * HOURS_PER_MONTH)
     )
 
-    # Find peak month per NPI using window function
+    # Peak month per NPI: highest claims first, earliest month breaking ties
     peak = (
         monthly
-        .with_columns(
-            pl.col("monthly_claims").max().over("_npi").alias("max_claims")
+        .sort(
+            ["_npi", "monthly_claims", "year_month"],
+            descending=[False, True, False],
         )
-        .filter(pl.col("monthly_claims") == pl.col("max_claims"))
         .group_by("_npi")
         .first()
         .with_columns(
             (pl.col("monthly_claims").cast(pl.Float64) / HOURS_PER_MONTH)
             .alias("claims_per_hour")
         )
-        .filter(pl.col("claims_per_hour") > THRESHOLD)
     )
 
     result = peak.collect()
 
     print(f"  Signal 4: {len(result)} organizations with impossible claim volumes")
 
-    flags: list[dict] = []
-    for row in result.iter_rows(named=True):
-        flags.append({
-            "npi": row["_npi"],
+    return [
+        {
+            "npi": npi,
             "signal_id": 4,
             "details": {
-                "peak_month": row["year_month"],
-                "claims_count": int(row["monthly_claims"]),
-                "implied_claims_per_hour": round(float(row["claims_per_hour"]), 2),
-                "peak_month_revenue": float(row["monthly_revenue"]),
+                "peak_month": month,
+                "claims_count": int(claims),
+                "implied_claims_per_hour": round(float(per_hour), 2),
+                "peak_month_revenue": float(revenue),
             },
-        })
-    return flags
+        }
+        for npi, month, claims, per_hour, revenue in result.select([
+            "_npi", "year_month", "monthly_claims", "claims_per_hour", "monthly_revenue",
+        ]).iter_rows()
+    ]
 
 
 def signal_5_shared_official(
@@ -594,26 +826,21 @@ def signal_5_shared_official(
         "signal_id" (5), and "details" with official_name, npi_list,
         per_npi_totals, and combined_total.
     """
-    npi_col = med_cols["npi"]
-    payment_col = med_cols["payment"]
-
     # Build official_name, handling null first names
     officials = (
-        nppes_lf
+        nppes_with_npi(nppes_lf)
         .filter(
             pl.col("Authorized Official Last Name").is_not_null()
             & (pl.col("Authorized Official Last Name").cast(pl.Utf8).str.strip_chars() != "")
         )
-        .with_columns([
-            normalize_npi(pl.col("NPI")).alias("_npi"),
-            (
-                pl.col("Authorized Official Last Name").cast(pl.Utf8).str.to_uppercase()
-                + ", "
-                + pl.col("Authorized Official First Name").cast(pl.Utf8)
-                    .fill_null("").str.to_uppercase()
-            ).alias("official_name"),
+        .select([
+            "_npi",
+            pl.format(
+                "{}, {}",
+                pl.col("Authorized Official Last Name").cast(pl.Utf8),
+                pl.col("Authorized Official First Name").cast(pl.Utf8).fill_null(""),
+            ).str.to_uppercase().alias("official_name"),
         ])
-        .select(["_npi", "official_name"])
     )
 
     # Count NPIs per official and filter 5+
@@ -635,48 +862,54 @@ def signal_5_shared_official(
 
     print(f"  Signal 5: {len(official_counts_df)} officials controlling 5+ NPIs")
 
-    # Get billing totals per NPI (single aggregation)
-    npi_billing = (
-        medicaid_lf
-        .with_columns(normalize_npi(pl.col(npi_col)).alias("_npi"))
-        .pipe(_filter_valid_npi)
-        .group_by("_npi")
-        .agg(pl.col(payment_col).sum().alias("npi_total_paid"))
-        .collect()
+    # Billing totals per NPI, shared with Signal 2
+    npi_billing = _npi_payment_totals(medicaid_lf, med_cols).rename(
+        {"total_paid": "npi_total_paid"}
     )
 
-    # Build a billing lookup dict for O(1) access
-    billing_map: dict[str, float] = dict(
-        zip(
-            npi_billing["_npi"].to_list(),
-            npi_billing["npi_total_paid"].to_list(),
+    # Attach billing to each official's NPIs in their original list order;
+    # NPIs without Medicaid billing contribute 0 and are left out of the
+    # per-NPI breakdown.
+    combined = (
+        official_counts_df.lazy()
+        .select(["official_name", pl.col("npi_list").alias("_npi")])
+        .explode("_npi")
+        .with_row_index("_pos")
+        .join(npi_billing.lazy(), on="_npi", how="left")
+        .sort("_pos")
+        .with_columns(pl.col("npi_total_paid").fill_null(0.0).cast(pl.Float64))
+        .group_by("official_name", maintain_order=True)
+        .agg([
+            pl.col("_npi").filter(pl.col("npi_total_paid") != 0).alias("billed_npis"),
+            pl.col("npi_total_paid").filter(pl.col("npi_total_paid") != 0)
+                .alias("billed_totals"),
+            pl.col("npi_total_paid").sum().alias("combined_total"),
+        ])
+        .filter(pl.col("combined_total") > 1_000_000)
+        .join(
+            official_counts_df.lazy().select(["official_name", "npi_list"]),
+            on="official_name",
+            how="left",
+            maintain_order="left",
         )
+        .collect()
     )
 
-    flags: list[dict] = []
-    for row in official_counts_df.iter_rows(named=True):
-        official = row["official_name"]
-        npis = row["npi_list"]
-
-        npi_totals: dict[str, float] = {}
-        combined = 0.0
-        for npi in npis:
-            total = billing_map.get(npi, 0.0)
-            if total:
-                npi_totals[npi] = float(total)
-                combined += float(total)
-
-        if combined > 1_000_000:
-            flags.append({
-                "npi": npis[0],
-                "signal_id": 5,
-                "details": {
-                    "official_name": official,
-                    "npi_list": npis,
-                    "per_npi_totals": npi_totals,
-                    "combined_total": round(combined, 2),
-                },
-            })
+    flags = [
+        {
+            "npi": npis[0],
+            "signal_id": 5,
+            "details": {
+                "official_name": official,
+                "npi_list": npis,
+                "per_npi_totals": dict(zip(billed_npis, billed_totals)),
+                "combined_total": round(total, 2),
+            },
+        }
+        for official, billed_npis, billed_totals, total, npis in combined.select([
+            "official_name", "billed_npis", "billed_totals", "combined_total", "npi_list",
+        ]).iter_rows()
+    ]
 
     print(f"  Signal 5: {len(flags)} officials with >$1M combined billing")
     return flags
@@ -707,35 +940,33 @@ def signal_6_geographic_implausibility(
     bene_col = med_cols["benes"]
     claims_col = med_cols["claims"]
 
-    hh_codes = list(HOME_HEALTH_CODES)
-
-    med = medicaid_lf.with_columns(
-        normalize_npi(pl.col(npi_col)).alias("_npi")
-    )
+    # Parse dates on the shared frame so the inferred layout is reused from
+    # the other signals; the hcpcs filter is still pushed into the reader.
+    date_dtype = medicaid_lf.collect_schema().get(date_col)
+    med = _to_date_col(medicaid_lf, date_col, date_dtype)
+    med = med.filter(pl.col(hcpcs_col).cast(pl.Utf8).is_in(_HH_CODES.implode()))
+    med = with_normalized_npi(med, npi_col)
     med = _filter_valid_npi(med)
-    med = _to_date_col(med, date_col)
-    med = _extract_year_month(med, date_col)
 
-    # Filter to home health codes and aggregate by NPI + month
+    # Aggregate home health claims by NPI + month; months are grouped as
+    # truncated dates and only formatted as "YYYY-MM" for the flagged rows
     monthly = (
         med
-        .filter(pl.col(hcpcs_col).cast(pl.Utf8).is_in(hh_codes))
-        .group_by(["_npi", "year_month"])
+        .group_by(["_npi", pl.col(date_col).dt.truncate("1mo").alias("month_start")])
         .agg([
             pl.col(bene_col).sum().alias("unique_benes"),
             pl.col(claims_col).sum().alias("total_claims"),
-            pl.col(hcpcs_col).first().alias("flagged_code"),
+            pl.col(hcpcs_col).cast(pl.Utf8).unique().sort().alias("flagged_codes"),
         ])
-        .filter(
-            (pl.col("total_claims") > 100)
-            & (pl.col("unique_benes").is_not_null())
-            & (pl.col("unique_benes") > 0)
-        )
         .with_columns(
             (pl.col("unique_benes").cast(pl.Float64) / pl.col("total_claims"))
             .alias("bene_claims_ratio")
         )
-        .filter(pl.col("bene_claims_ratio") < 0.1)
+        .filter(
+            (pl.col("total_claims") > 100)
+            & (pl.col("unique_benes") > 0)
+            & (pl.col("bene_claims_ratio") < 0.1)
+        )
         .collect()
     )
 
@@ -749,20 +980,24 @@ def signal_6_geographic_implausibility(
         .sort("bene_claims_ratio")
         .group_by("_npi")
         .first()
+        .with_columns(pl.col("month_start").dt.strftime("%Y-%m").alias("year_month"))
     )
 
-    flags: list[dict] = []
-    for row in provider_flags.iter_rows(named=True):
-        flags.append({
-            "npi": row["_npi"],
+    return [
+        {
+            "npi": npi,
             "signal_id": 6,
             "details": {
                 "state": "",
-                "flagged_codes": [row["flagged_code"]],
-                "month": row["year_month"],
-                "claims": int(row["total_claims"]),
-                "unique_beneficiaries": int(row["unique_benes"]),
-                "ratio": round(float(row["bene_claims_ratio"]), 4),
+                "flagged_codes": codes,
+                "month": month,
+                "claims": int(claims),
+                "unique_beneficiaries": int(benes),
+                "ratio": round(float(ratio), 4),
             },
-        })
-    return flags
+        }
+        for npi, codes, month, claims, benes, ratio in provider_flags.select([
+            "_npi", "flagged_codes", "year_month", "total_claims", "unique_benes",
+            "bene_claims_ratio",
+        ]).iter_rows()
+    ]
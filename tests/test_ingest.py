@@ -1,8 +1,20 @@
 """Tests for the ingest module: column detection, NPI normalization."""
+from datetime import date
+
 import polars as pl
 import pytest
 
-from src.ingest import detect_medicaid_columns, normalize_npi
+from src.ingest import (
+    _cached_schema,
+    detect_medicaid_columns,
+    load_leie,
+    load_medicaid,
+    load_nppes,
+    normalize_npi,
+    parse_yyyymmdd,
+    nppes_with_npi,
+    with_normalized_npi,
+)
 
 
 class TestDetectMedicaidColumns:
@@ -110,3 +122,201 @@ class TestNormalizeNpi:
         df = pl.DataFrame({"npi": ["123", "1234567890", "  456  "]})
         result = df.select(normalize_npi(pl.col("npi")).alias("npi"))
         assert result["npi"].to_list() == ["0000000123", "1234567890", "0000000456"]
+
+
+class TestParseYyyymmdd:
+    """Tests for parse_yyyymmdd()."""
+
+    def test_parses_integer_and_string_dates(self):
+        """Integer and string YYYYMMDD values should parse to the same date."""
+        df = pl.DataFrame({"i": [20200115, 20240229], "s": ["20200115", "20240229"]})
+        result = df.select(
+            parse_yyyymmdd(pl.col("i")).alias("i"),
+            parse_yyyymmdd(pl.col("s")).alias("s"),
+        )
+        expected = [date(2020, 1, 15), date(2024, 2, 29)]
+        assert result["i"].to_list() == expected
+        assert result["s"].to_list() == expected
+
+    def test_invalid_dates_become_null(self):
+        """Placeholders and impossible calendar dates should become null."""
+        df = pl.DataFrame({"d": ["00000000", "0", "", None, "20230229", "20201301", "abc"]})
+        result = df.select(parse_yyyymmdd(pl.col("d")).alias("d"))
+        assert result["d"].null_count() == len(df)
+
+
+class TestLoadMedicaid:
+    """Tests for load_medicaid()."""
+
+    def test_projects_to_detected_columns(self, tmp_path):
+        """Columns outside the mapping should be dropped from the scan."""
+        df = pl.DataFrame({
+            "Rndrng_NPI": ["1234567890"],
+            "HCPCS_Cd": ["99213"],
+            "Srvc_Dt": ["2023-06-15"],
+            "Bene_Cnt": [10],
+            "Clm_Cnt": [20],
+            "Pymt_Amt": [1000.0],
+            "Unused_Col": ["x"],
+        })
+        df.write_parquet(tmp_path / "medicaid-provider-spending.parquet")
+
+        lf, col_map = load_medicaid(str(tmp_path))
+
+        assert col_map["npi"] == "_npi"
+        assert col_map["payment"] == "Pymt_Amt"
+        assert "Unused_Col" not in lf.collect_schema().names()
+        assert lf.collect()["Pymt_Amt"].to_list() == [1000.0]
+
+    def test_keeps_servicing_npi_column(self, tmp_path):
+        """The servicing NPI column used by Signal 1 should survive projection."""
+        df = pl.DataFrame({
+            "Rndrng_NPI": ["1234567890"],
+            "HCPCS_Cd": ["99213"],
+            "Srvc_Dt": ["2023-06-15"],
+            "Bene_Cnt": [10],
+            "Clm_Cnt": [20],
+            "Pymt_Amt": [1000.0],
+            "SERVICING_PROVIDER_NPI_NUM": ["1111111111"],
+        })
+        df.write_parquet(tmp_path / "medicaid-provider-spending.parquet")
+
+        lf, _ = load_medicaid(str(tmp_path))
+
+        assert "SERVICING_PROVIDER_NPI_NUM" in lf.collect_schema().names()
+
+    def test_normalizes_npi_at_load(self, tmp_path):
+        """The NPI column should be normalized once into "_npi"."""
+        df = pl.DataFrame({
+            "Rndrng_NPI": [123],
+            "HCPCS_Cd": ["99213"],
+            "Srvc_Dt": ["2023-06-15"],
+            "Bene_Cnt": [10],
+            "Clm_Cnt": [20],
+            "Pymt_Amt": [1000.0],
+        })
+        df.write_parquet(tmp_path / "medicaid-provider-spending.parquet")
+
+        lf, _ = load_medicaid(str(tmp_path))
+
+        assert lf.collect()["_npi"].to_list() == ["0000000123"]
+
+    def test_missing_file_raises(self, tmp_path):
+        """A missing parquet file should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_medicaid(str(tmp_path))
+
+
+class TestCsvCaches:
+    """Tests for the converted caches used by load_leie() and load_nppes()."""
+
+    def test_leie_cache_written_and_reused(self, tmp_path):
+        """LEIE should be cached on first load and read from the cache after."""
+        (tmp_path / "UPDATED.csv").write_text(
+            "LASTNAME,NPI,EXCLDATE,EXCLTYPE,REINDATE\n"
+            "DOE,1234567890,20200115,1128(a)(1),\n"
+        )
+
+        first = load_leie(str(tmp_path))
+        assert (tmp_path / "UPDATED.arrow").exists()
+
+        second = load_leie(str(tmp_path))
+        assert second["npi_str"].to_list() == first["npi_str"].to_list()
+        assert second["excl_date_parsed"].to_list() == first["excl_date_parsed"].to_list()
+
+    def test_leie_unwritable_cache_still_loads(self, tmp_path, monkeypatch):
+        """A failed LEIE cache write should still return the parsed CSV."""
+        (tmp_path / "UPDATED.csv").write_text(
+            "LASTNAME,NPI,EXCLDATE,EXCLTYPE,REINDATE\n"
+            "DOE,1234567890,20200115,1128(a)(1),\n"
+        )
+
+        def fail_write(self, path, *args, **kwargs):
+            raise PermissionError(f"read-only: {path}")
+
+        monkeypatch.setattr(pl.DataFrame, "write_ipc", fail_write)
+        df = load_leie(str(tmp_path))
+
+        assert df["npi_str"].to_list() == ["1234567890"]
+        assert not (tmp_path / "UPDATED.arrow").exists()
+
+    def test_nppes_parquet_holds_projected_columns(self, tmp_path):
+        """NPPES parquet conversion should contain only the selected columns."""
+        (tmp_path / "npidata_pfile_test.csv").write_text(
+            "NPI,Entity Type Code,Provider First Name,Extra Column\n"
+            "1234567890,1,JOHN,ignored\n"
+        )
+
+        lf = load_nppes(str(tmp_path))
+
+        assert (tmp_path / "nppes.parquet").exists()
+        assert lf.collect_schema().names() == [
+            "NPI", "Entity Type Code", "Provider First Name", "_npi",
+        ]
+        assert lf.collect()["Provider First Name"].to_list() == ["JOHN"]
+
+
+    def test_nppes_unwritable_parquet_falls_back_to_csv(self, tmp_path, monkeypatch):
+        """A failed NPPES parquet conversion should fall back to scanning the CSV."""
+        (tmp_path / "npidata_pfile_test.csv").write_text(
+            "NPI,Entity Type Code,Provider First Name,Extra Column\n"
+            "1234567890,1,JOHN,ignored\n"
+        )
+
+        def fail_sink(self, path, *args, **kwargs):
+            raise PermissionError(f"read-only: {path}")
+
+        monkeypatch.setattr(pl.LazyFrame, "sink_parquet", fail_sink)
+        lf = load_nppes(str(tmp_path))
+
+        assert not (tmp_path / "nppes.parquet").exists()
+        assert lf.collect_schema().names() == ["NPI", "Entity Type Code", "Provider First Name"]
+        assert lf.collect()["Provider First Name"].to_list() == ["JOHN"]
+
+
+class TestCachedSchema:
+    """Tests for the on-disk schema cache."""
+
+    def test_computes_once_per_file_version(self, tmp_path):
+        """Inference should only rerun when the file changes."""
+        data_file = tmp_path / "data.csv"
+        data_file.write_text("a\n1\n")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"a": "Int64"}
+
+        assert _cached_schema(str(data_file), compute) == {"a": "Int64"}
+        assert _cached_schema(str(data_file), compute) == {"a": "Int64"}
+        assert len(calls) == 1
+        assert (tmp_path / ".schema_cache.json").exists()
+
+        data_file.write_text("a\n1\n2\n")
+        _cached_schema(str(data_file), compute)
+        assert len(calls) == 2
+
+
+class TestNormalizedNpiHelpers:
+    """Tests for with_normalized_npi() and nppes_with_npi()."""
+
+    def test_with_normalized_npi_adds_column(self):
+        """A raw NPI column should be normalized into "_npi"."""
+        lf = pl.DataFrame({"npi": ["123"]}).lazy()
+        result = with_normalized_npi(lf, "npi").collect()
+        assert result["_npi"].to_list() == ["0000000123"]
+
+    def test_with_normalized_npi_reuses_existing(self):
+        """An already-normalized "_npi" column should be left untouched."""
+        lf = pl.DataFrame({"_npi": ["0000000123"]}).lazy()
+        assert with_normalized_npi(lf, "_npi") is lf
+
+    def test_nppes_with_npi_reuses_existing(self):
+        """NPPES frames that already carry "_npi" should be returned as-is."""
+        lf = pl.DataFrame({"NPI": ["123"], "_npi": ["0000000123"]}).lazy()
+        assert nppes_with_npi(lf) is lf
+
+    def test_nppes_with_npi_normalizes_raw(self):
+        """NPPES frames without "_npi" should normalize the NPI column."""
+        lf = pl.DataFrame({"NPI": [123]}).lazy()
+        assert nppes_with_npi(lf).collect()["_npi"].to_list() == ["0000000123"]
@@ -0,0 +1,160 @@
+"""Tests for the main module: flag enrichment and signal flag caching."""
+import os
+
+import pytest
+
+from src.main import (
+    _SIGNAL_SOURCES,
+    _cached_signal,
+    _signal_cache_path,
+    enrich_flags_with_nppes,
+)
+from tests.fixtures import make_medicaid_df, make_nppes_df, TEST_MED_COLS
+
+
+class TestEnrichFlagsWithNppes:
+    """Tests for enrich_flags_with_nppes()."""
+
+    def _datasets(self):
+        medicaid = make_medicaid_df([
+            {"npi": "1111111111", "payment": 1000.0, "claims": 10, "benes": 5},
+            {"npi": "1111111111", "payment": 500.0, "claims": 4, "benes": 2},
+            {"npi": "2222222222", "payment": 300.0, "claims": 3, "benes": 1},
+        ])
+        nppes = make_nppes_df([
+            {"npi": "1111111111", "entity_type": "1", "last_name": "SMITH",
+             "first_name": "JANE", "state": "NY"},
+            {"npi": "2222222222", "entity_type": "2", "org_name": "Acme Health LLC",
+             "state": "TX"},
+        ])
+        return medicaid.lazy(), nppes.lazy()
+
+    def test_empty_flags_returns_empty(self):
+        """No flags should produce no provider entries."""
+        medicaid, nppes = self._datasets()
+        assert enrich_flags_with_nppes([], nppes, medicaid, TEST_MED_COLS) == []
+
+    def test_attaches_metadata_and_lifetime_totals(self):
+        """Entries should carry NPPES metadata and lifetime billing sums."""
+        medicaid, nppes = self._datasets()
+        flags = [{"npi": "1111111111", "signal_id": 4, "details": {
+            "peak_month": "2023-06", "claims_count": 2000,
+            "implied_claims_per_hour": 11.36, "peak_month_revenue": 1500.0,
+        }}]
+
+        entries = enrich_flags_with_nppes(flags, nppes, medicaid, TEST_MED_COLS)
+
+        assert len(entries) == 1
+        entry = entries[0]
+        assert entry["provider_name"] == "SMITH JANE"
+        assert entry["entity_type"] == "individual"
+        assert entry["state"] == "NY"
+        assert entry["total_paid_all_time"] == 1500.0
+        assert entry["total_claims_all_time"] == 14
+        assert entry["total_unique_beneficiaries_all_time"] == 7
+
+    def test_groups_multiple_flags_per_npi(self):
+        """Multiple flags for one NPI should collapse into one entry."""
+        medicaid, nppes = self._datasets()
+        flags = [
+            {"npi": "2222222222", "signal_id": 4, "details": {
+                "claims_count": 2000, "peak_month_revenue": 1000.0}},
+            {"npi": "2222222222", "signal_id": 6, "details": {
+                "state": "", "claims": 300, "unique_beneficiaries": 3, "ratio": 0.01}},
+        ]
+
+        entries = enrich_flags_with_nppes(flags, nppes, medicaid, TEST_MED_COLS)
+
+        assert len(entries) == 1
+        assert entries[0]["provider_name"] == "Acme Health LLC"
+        assert entries[0]["entity_type"] == "organization"
+        assert len(entries[0]["signals"]) == 2
+        # Signal 6 state is back-filled from NPPES
+        assert entries[0]["signals"][1]["evidence"]["state"] == "TX"
+
+    def test_unknown_npi_gets_defaults(self):
+        """Flags for NPIs absent from NPPES and Medicaid should use defaults."""
+        medicaid, nppes = self._datasets()
+        flags = [{"npi": "9999999999", "signal_id": 1, "details": {"post_exclusion_paid": 0.0}}]
+
+        entries = enrich_flags_with_nppes(flags, nppes, medicaid, TEST_MED_COLS)
+
+        assert entries[0]["provider_name"] == "Unknown"
+        assert entries[0]["entity_type"] == "unknown"
+        assert entries[0]["total_paid_all_time"] == 0.0
+
+    def test_missing_name_falls_back_to_unknown(self):
+        """Providers whose NPPES name fields are empty should be named Unknown."""
+        medicaid, _ = self._datasets()
+        nppes = make_nppes_df([
+            {"npi": "1111111111", "entity_type": "2", "org_name": None, "state": "NY"},
+        ]).lazy()
+        flags = [{"npi": "1111111111", "signal_id": 4, "details": {}}]
+
+        entries = enrich_flags_with_nppes(flags, nppes, medicaid, TEST_MED_COLS)
+
+        assert entries[0]["provider_name"] == "Unknown"
+        assert entries[0]["entity_type"] == "organization"
+
+
+class TestSignalCache:
+    """Tests for _signal_cache_path() and _cached_signal()."""
+
+    FLAGS = [{"npi": "1111111111", "signal_id": 3,
+              "details": {"twelve_month_progression": {"2023-01": 10.0}}}]
+
+    def test_second_run_reads_cache(self, tmp_path):
+        """A cached signal should be returned without running it again."""
+        calls = []
+
+        def runner():
+            calls.append(1)
+            return self.FLAGS
+
+        path = _signal_cache_path(str(tmp_path), "signal_3")
+        assert _cached_signal(path, runner) == self.FLAGS
+        assert _cached_signal(path, runner) == self.FLAGS
+        assert len(calls) == 1
+
+    def test_input_change_invalidates_key(self, tmp_path):
+        """Changing an input file should produce a new key and drop the stale cache."""
+        input_path = tmp_path / "UPDATED.csv"
+        input_path.write_text("NPI\n1\n")
+        old_path = _signal_cache_path(str(tmp_path), "signal_1")
+        _cached_signal(old_path, lambda: [])
+
+        input_path.write_text("NPI\n1\n2\n")
+        new_path = _signal_cache_path(str(tmp_path), "signal_1")
+        assert new_path != old_path
+
+        _cached_signal(new_path, lambda: self.FLAGS)
+        assert [str(p) for p in (tmp_path / ".cache").iterdir()] == [new_path]
+
+    def test_nppes_csv_change_invalidates_key(self, tmp_path):
+        """A new NPPES CSV should miss the cache even without nppes.parquet."""
+        csv_path = tmp_path / "npidata_pfile_test.csv"
+        csv_path.write_text("NPI\n1\n")
+        old_path = _signal_cache_path(str(tmp_path), "signal_5")
+
+        csv_path.write_text("NPI\n1\n2\n")
+        assert _signal_cache_path(str(tmp_path), "signal_5") != old_path
+
+    def test_failed_run_is_not_cached(self, tmp_path):
+        """A signal that raises should not leave a cache file behind."""
+        def runner():
+            raise RuntimeError("boom")
+
+        path = _signal_cache_path(str(tmp_path), "signal_2")
+        with pytest.raises(RuntimeError):
+            _cached_signal(path, runner)
+        assert not (tmp_path / ".cache").exists()
+
+    def test_unwritable_cache_still_returns_flags(self, tmp_path):
+        """A cache directory that cannot be created should not lose the flags."""
+        (tmp_path / ".cache").write_text("not a directory")
+        path = _signal_cache_path(str(tmp_path), "signal_4")
+        assert _cached_signal(path, lambda: self.FLAGS) == self.FLAGS
+
+    def test_key_covers_ingest_source(self):
+        """Loader changes should invalidate cached flags as well as signal changes."""
+        assert {os.path.basename(p) for p in _SIGNAL_SOURCES} == {"signals.py", "ingest.py"}
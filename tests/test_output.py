@@ -9,6 +9,8 @@ from src.output import (
     estimate_overpayment,
     build_provider_entry,
     build_report,
+    write_report,
+    write_report_streaming,
     _json_serializer,
     SIGNAL_TYPES,
     FCA_STATUTES,
@@ -257,6 +259,46 @@ class TestBuildReport:
         datetime.fromisoformat(report["generated_at"])
 
 
+class TestWriteReport:
+    """Tests for write_report()."""
+
+    def test_round_trips_through_json(self, tmp_path):
+        """The written file should parse back to the same report."""
+        report = build_report(flagged_providers=[], scan_count=3, signal_tallies={"signal_1": 1})
+        report["extra_date"] = date(2023, 6, 15)
+        path = tmp_path / "report.json"
+
+        write_report(report, str(path))
+
+        loaded = json.loads(path.read_text())
+        assert loaded["total_providers_scanned"] == 3
+        assert loaded["signal_counts"]["excluded_provider"] == 1
+        assert loaded["extra_date"] == "2023-06-15"
+
+    @pytest.mark.parametrize("count", [0, 1, 3])
+    def test_streaming_matches_full_write(self, tmp_path, count):
+        """Streaming providers should produce the same bytes as write_report()."""
+        providers = [
+            build_provider_entry(
+                npi=f"{i:010d}", provider_name="Test", entity_type="individual",
+                taxonomy_code="", state="NY", enumeration_date="",
+                lifetime_paid=100.0, lifetime_claims=10, lifetime_benes=5,
+                signals=[{"signal_id": 2, "details": {"ratio_to_peer_median": 6}}],
+            )
+            for i in range(count)
+        ]
+        report = build_report(flagged_providers=providers, scan_count=10, signal_tallies={})
+        header = {k: v for k, v in report.items() if k != "flagged_providers"}
+        full_path = tmp_path / "full.json"
+        stream_path = tmp_path / "stream.json"
+
+        write_report(report, str(full_path))
+        written = write_report_streaming(header, iter(providers), str(stream_path))
+
+        assert written == count
+        assert stream_path.read_bytes() == full_path.read_bytes()
+
+
 class TestJsonSerializer:
     """Tests for _json_serializer()."""
 
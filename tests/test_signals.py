@@ -1,9 +1,12 @@
 """Unit tests for all six fraud signal detection algorithms."""
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 import polars as pl
 import pytest
 
+import src.signals
 from src.signals import (
     signal_1_excluded_billing,
     signal_2_volume_outlier,
@@ -12,6 +15,11 @@ from src.signals import (
     signal_5_shared_official,
     signal_6_geographic_implausibility,
     HOME_HEALTH_CODES,
+    _DATE_FORMAT_CACHE,
+    _DATE_SAMPLE_ROWS,
+    _monthly_npi_totals,
+    _npi_payment_totals,
+    _to_date_col,
 )
 from tests.fixtures import (
     make_medicaid_df,
@@ -80,6 +88,49 @@ class TestSignal1ExcludedBilling:
         assert all(f["npi"] != "" for f in flags)
         assert all(f["npi"] != "0000000000" for f in flags)
 
+    def test_merges_billing_and_servicing_npi(self):
+        """Excluded NPIs should be caught in either NPI column and summed per NPI."""
+        medicaid = make_medicaid_df([
+            {"npi": "1111111111", "service_date": date(2023, 6, 1), "payment": 5000.0, "claims": 10},
+            {"npi": "3333333333", "service_date": date(2023, 8, 1), "payment": 2000.0, "claims": 4},
+            {"npi": "4444444444", "service_date": date(2023, 9, 1), "payment": 700.0, "claims": 2},
+        ]).with_columns(
+            pl.Series("SERVICING_PROVIDER_NPI_NUM", ["2222222222", "1111111111", ""])
+        )
+        leie = make_leie_df([
+            {"npi": "1111111111", "excldate": "20200115", "reindate": None},
+            {"npi": "2222222222", "excldate": "20200115", "reindate": None},
+        ])
+
+        flags = signal_1_excluded_billing(medicaid.lazy(), TEST_MED_COLS, leie)
+        by_npi = {f["npi"]: f["details"] for f in flags}
+
+        assert set(by_npi) == {"1111111111", "2222222222"}
+        assert by_npi["1111111111"]["post_exclusion_paid"] == 7000.0
+        assert by_npi["1111111111"]["post_exclusion_claims"] == 14
+        assert by_npi["1111111111"]["first_post_excl_billing"] == "2023-06-01"
+        assert by_npi["1111111111"]["last_post_excl_billing"] == "2023-08-01"
+        assert by_npi["2222222222"]["post_exclusion_paid"] == 5000.0
+
+    def test_repeated_exclusions_counted_once(self):
+        """Multiple LEIE records for one NPI should not multiply its billing."""
+        medicaid = make_medicaid_df([
+            {"npi": "1111111111", "service_date": date(2021, 6, 1), "payment": 5000.0, "claims": 10},
+            {"npi": "1111111111", "service_date": date(2023, 6, 1), "payment": 3000.0, "claims": 5},
+        ])
+        leie = make_leie_df([
+            {"npi": "1111111111", "excldate": "20220301", "excltype": "1128(b)(4)", "reindate": None},
+            {"npi": "1111111111", "excldate": "20200115", "excltype": "1128(a)(1)", "reindate": None},
+        ])
+
+        flags = signal_1_excluded_billing(medicaid.lazy(), TEST_MED_COLS, leie)
+
+        assert len(flags) == 1
+        details = flags[0]["details"]
+        assert details["post_exclusion_paid"] == 8000.0
+        assert details["post_exclusion_claims"] == 15
+        assert details["exclusion_type"] == "1128(a)(1)"
+
 
 class TestSignal2VolumeOutlier:
     """Tests for Signal 2: Billing Volume Outlier."""
@@ -292,6 +343,38 @@ class TestSignal5SharedOfficial:
         flags = signal_5_shared_official(medicaid.lazy(), TEST_MED_COLS, nppes.lazy())
         assert isinstance(flags, list)
 
+    def test_unbilled_npis_listed_but_not_totaled(self):
+        """NPIs without billing stay in npi_list but not in per_npi_totals."""
+        medicaid_rows = []
+        nppes_rows = []
+        for i in range(6):
+            npi = f"80000000{i:02d}"
+            if i % 2 == 0:
+                medicaid_rows.append({"npi": npi, "payment": 400000.0, "claims": 100})
+            nppes_rows.append({
+                "npi": npi,
+                "entity_type": "2",
+                "org_name": f"Clinic {i}",
+                "auth_last": "SMITH",
+                "auth_first": "JANE",
+            })
+
+        medicaid = make_medicaid_df(medicaid_rows)
+        nppes = make_nppes_df(nppes_rows)
+
+        flags = signal_5_shared_official(medicaid.lazy(), TEST_MED_COLS, nppes.lazy())
+
+        assert len(flags) == 1
+        details = flags[0]["details"]
+        assert details["npi_list"] == [f"80000000{i:02d}" for i in range(6)]
+        assert flags[0]["npi"] == details["npi_list"][0]
+        assert details["per_npi_totals"] == {
+            "8000000000": 400000.0,
+            "8000000002": 400000.0,
+            "8000000004": 400000.0,
+        }
+        assert details["combined_total"] == 1200000.0
+
 
 class TestSignal6GeographicImplausibility:
     """Tests for Signal 6: Geographic Implausibility."""
@@ -316,6 +399,21 @@ class TestSignal6GeographicImplausibility:
         assert flags[0]["details"]["ratio"] < 0.1
         assert flags[0]["details"]["claims"] > 100
 
+    def test_lists_every_home_health_code_in_month(self):
+        """All distinct home health codes billed in the flagged month are listed."""
+        rows = [
+            {"npi": "9000000001", "hcpcs": code, "service_date": date(2023, 6, 1),
+             "benes": 2, "claims": 60, "payment": 3000.0}
+            for code in ["T1019", "G0151", "T1019"]
+        ]
+        medicaid = make_medicaid_df(rows)
+
+        flags = signal_6_geographic_implausibility(medicaid.lazy(), TEST_MED_COLS)
+
+        assert len(flags) == 1
+        assert flags[0]["details"]["flagged_codes"] == ["G0151", "T1019"]
+        assert flags[0]["details"]["claims"] == 180
+
     def test_normal_ratio_not_flagged(self):
         """Provider with normal beneficiary ratio should not be flagged."""
         rows = [
@@ -516,6 +614,20 @@ class TestSignal4EdgeCases:
         assert len(flags) == 1
         assert flags[0]["details"]["implied_claims_per_hour"] > 6
 
+    def test_tied_peak_reports_earliest_month(self):
+        """When two months tie for peak claims, the earlier month is reported."""
+        rows = [
+            {"npi": "6666666666", "service_date": date(2023, 8, 1), "payment": 9000.0, "claims": 2000},
+            {"npi": "6666666666", "service_date": date(2023, 3, 1), "payment": 7000.0, "claims": 2000},
+            {"npi": "6666666666", "service_date": date(2023, 5, 1), "payment": 1000.0, "claims": 100},
+        ]
+        medicaid = make_medicaid_df(rows)
+        nppes = make_nppes_df([{"npi": "6666666666", "entity_type": "2", "org_name": "Clinic"}])
+        flags = signal_4_workforce_impossibility(medicaid.lazy(), TEST_MED_COLS, nppes.lazy())
+        assert len(flags) == 1
+        assert flags[0]["details"]["peak_month"] == "2023-03"
+        assert flags[0]["details"]["peak_month_revenue"] == 7000.0
+
     def test_very_large_claim_volume(self):
         """Extremely large claim volume should be handled."""
         rows = [
@@ -656,3 +768,105 @@ class TestSignal6EdgeCases:
         flagged_npis = {f["npi"] for f in flags}
         assert "9000000001" in flagged_npis
         assert "9000000002" in flagged_npis
+
+
+class TestToDateCol:
+    """Tests for _to_date_col() date layout handling."""
+
+    @pytest.mark.parametrize("values", [
+        ["2023-06-15", "2023-07-01"],
+        ["20230615", "20230701"],
+        ["06/15/2023", "07/01/2023"],
+    ])
+    def test_single_layout(self, values):
+        """A column in one layout should parse every row."""
+        lf = pl.LazyFrame({"d": values})
+        result = _to_date_col(lf, "d").collect()["d"].to_list()
+        assert result == [date(2023, 6, 15), date(2023, 7, 1)]
+
+    def test_year_month_layout(self):
+        """YYYY-MM values should parse to the first of the month."""
+        lf = pl.LazyFrame({"d": ["2023-06", "2023-07"]})
+        result = _to_date_col(lf, "d").collect()["d"].to_list()
+        assert result == [date(2023, 6, 1), date(2023, 7, 1)]
+
+    def test_mixed_layouts_fall_back_per_row(self):
+        """Mixed layouts should still parse each row with its own format."""
+        lf = pl.LazyFrame({"d": ["2023-06-15", "20230701", "08/02/2023", "2023-09", "bad"]})
+        result = _to_date_col(lf, "d").collect()["d"].to_list()
+        assert result == [
+            date(2023, 6, 15), date(2023, 7, 1), date(2023, 8, 2), date(2023, 9, 1), None,
+        ]
+
+    def test_other_layout_after_sample_still_parsed(self):
+        """Rows past the sample in a different layout should not become null."""
+        values = ["2023-06-15"] * _DATE_SAMPLE_ROWS + ["20230701"]
+        lf = pl.LazyFrame({"d": values})
+        result = _to_date_col(lf, "d").collect()["d"]
+        assert result.null_count() == 0
+        assert result[-1] == date(2023, 7, 1)
+        assert _DATE_FORMAT_CACHE[id(lf)][1] == {"d": None}
+
+    def test_layout_inferred_once_per_frame(self):
+        """Repeated calls on the same frame should reuse the inferred layout."""
+        lf = pl.LazyFrame({"d": ["20230615"]})
+        _to_date_col(lf, "d")
+        assert _DATE_FORMAT_CACHE[id(lf)][1] == {"d": 1}
+        assert _to_date_col(lf, "d").collect()["d"].to_list() == [date(2023, 6, 15)]
+
+
+    def test_concurrent_callers_check_layout_once(self, monkeypatch):
+        """Threads sharing a frame should wait for one layout check."""
+        calls = []
+        detect = src.signals._detect_date_format
+
+        def slow_detect(lf, col):
+            calls.append(col)
+            time.sleep(0.05)
+            return detect(lf, col)
+
+        monkeypatch.setattr(src.signals, "_detect_date_format", slow_detect)
+        lf = pl.LazyFrame({"d": ["20230615"]})
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: _to_date_col(lf, "d").collect(), range(4)))
+
+        assert calls == ["d"]
+        assert all(r["d"].to_list() == [date(2023, 6, 15)] for r in results)
+
+class TestMonthlyNpiTotals:
+    """Tests for the per-NPI monthly totals shared by Signals 3 and 4."""
+
+    def test_sums_by_npi_and_month(self):
+        """Rows in the same NPI and month should be summed."""
+        medicaid = make_medicaid_df([
+            {"npi": "1111111111", "service_date": date(2023, 6, 1), "payment": 100.0, "claims": 1},
+            {"npi": "1111111111", "service_date": date(2023, 6, 20), "payment": 50.0, "claims": 2},
+            {"npi": "1111111111", "service_date": date(2023, 7, 1), "payment": 25.0, "claims": 3},
+        ])
+        result = _monthly_npi_totals(medicaid.lazy(), TEST_MED_COLS).sort("year_month")
+        assert result["year_month"].to_list() == ["2023-06", "2023-07"]
+        assert result["monthly_paid"].to_list() == [150.0, 25.0]
+        assert result["monthly_claims"].to_list() == [3, 3]
+
+    def test_computed_once_per_frame(self):
+        """Repeated calls on the same frame should return the cached result."""
+        lf = make_medicaid_df([
+            {"npi": "1111111111", "service_date": date(2023, 6, 1), "payment": 100.0, "claims": 1},
+        ]).lazy()
+        first = _monthly_npi_totals(lf, TEST_MED_COLS)
+        assert _monthly_npi_totals(lf, TEST_MED_COLS) is first
+
+
+class TestNpiPaymentTotals:
+    """Tests for the per-NPI payment totals shared by Signals 2 and 5."""
+
+    def test_sums_valid_npis_once_per_frame(self):
+        """Payments are summed per valid NPI and cached for the frame."""
+        lf = make_medicaid_df([
+            {"npi": "1111111111", "payment": 100.0, "claims": 1},
+            {"npi": "1111111111", "payment": 50.0, "claims": 1},
+            {"npi": "", "payment": 75.0, "claims": 1},
+        ]).lazy()
+        result = _npi_payment_totals(lf, TEST_MED_COLS)
+        assert result.to_dicts() == [{"_npi": "1111111111", "total_paid": 150.0}]
+        assert _npi_payment_totals(lf, TEST_MED_COLS) is result